@@ -1,4 +1,5 @@
 from django.contrib import admin
+from django.contrib.admin.views.main import ChangeList
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 from django.contrib.auth.models import User
 from django.utils.html import format_html
@@ -40,6 +41,15 @@ class UserRateLimitInline(admin.TabularInline):
 class UserAdmin(BaseUserAdmin):
     """Extended User admin with profile and rate limit fields."""
     inlines = (UserProfileInline, UserRateLimitInline)
+    
+    def get_search_results(self, request, queryset, search_term):
+        """Also match users by profile phone number, ignoring formatting."""
+        queryset, may_have_duplicates = super().get_search_results(request, queryset, search_term)
+        digits = ''.join(ch for ch in search_term if ch.isdigit())
+        if len(digits) >= 6:
+            phone_matches = UserProfile.objects.filter_phone(search_term).values('user_id')
+            queryset |= self.model.objects.filter(pk__in=phone_matches)
+        return queryset, may_have_duplicates
 
 
 class PhotoConfigurationInline(admin.TabularInline):
@@ -52,7 +62,7 @@ class PhotoConfigurationInline(admin.TabularInline):
 
 class PhotoGenerationAdmin(admin.ModelAdmin):
     """Admin for PhotoGeneration model with soft delete support."""
-    list_display = ('session_id', 'user', 'output_type', 'created_at', 'total_copies', 'file_size_bytes', 'deletion_status')
+    list_display = ('session_hex', 'user', 'output_type', 'created_at', 'total_copies', 'file_size_bytes', 'deletion_status')
     list_filter = ('output_type', 'paper_size', 'created_at', 'orientation', 'deleted_at')
     search_fields = ('user__username', 'user__email', 'session_id')
     readonly_fields = ('session_id', 'created_at', 'file_size_bytes', 'deleted_at', 'deleted_by', 'deletion_reason')
@@ -76,7 +86,13 @@ class PhotoGenerationAdmin(admin.ModelAdmin):
     
     def get_queryset(self, request):
         """Show all objects including soft-deleted in admin."""
-        return self.model.all_objects.get_queryset()
+        return self.model.all_objects.with_related()
+    
+    def session_hex(self, obj):
+        """Display session ID as hex, matching the output folder name."""
+        return obj.session_id.hex
+    session_hex.short_description = 'Session ID'
+    session_hex.admin_order_field = 'session_id'
     
     def deletion_status(self, obj):
         """Display deletion status badge."""
@@ -89,10 +105,11 @@ class PhotoGenerationAdmin(admin.ModelAdmin):
     
     def soft_delete_selected(self, request, queryset):
         """Soft delete selected objects."""
-        count = 0
-        for obj in queryset.filter(deleted_at__isnull=True):
-            obj.delete(deleted_by=request.user, reason=f'Deleted via admin by {request.user.username}')
-            count += 1
+        count = self.model.objects.bulk_soft_delete(
+            queryset,
+            deleted_by=request.user,
+            reason=f'Deleted via admin by {request.user.username}',
+        )
         self.message_user(request, f'{count} record(s) soft deleted.')
     soft_delete_selected.short_description = "Soft delete selected items"
     
@@ -133,7 +150,7 @@ class GenerationAuditAdmin(admin.ModelAdmin):
     """Admin for GenerationAudit model with soft delete support."""
     list_display = ('generation', 'action', 'user', 'timestamp', 'ip_address', 'deletion_status')
     list_filter = ('action', 'timestamp', 'deleted_at')
-    search_fields = ('user__username', 'generation__session_id', 'ip_address')
+    search_fields = ('user__username', 'session_id', 'ip_address')
     readonly_fields = ('timestamp', 'details', 'deleted_at', 'deleted_by', 'deletion_reason')
     date_hierarchy = 'timestamp'
     actions = ['soft_delete_selected', 'restore_selected']
@@ -151,10 +168,11 @@ class GenerationAuditAdmin(admin.ModelAdmin):
     
     def soft_delete_selected(self, request, queryset):
         """Soft delete selected objects."""
-        count = 0
-        for obj in queryset.filter(deleted_at__isnull=True):
-            obj.delete(deleted_by=request.user, reason=f'Deleted via admin by {request.user.username}')
-            count += 1
+        count = self.model.objects.bulk_soft_delete(
+            queryset,
+            deleted_by=request.user,
+            reason=f'Deleted via admin by {request.user.username}',
+        )
         self.message_user(request, f'{count} audit record(s) soft deleted.')
     soft_delete_selected.short_description = "Soft delete selected items"
     
@@ -200,6 +218,14 @@ admin.site.register(FeatureUsage, FeatureUsageAdmin)
 admin.site.register(UserProfile)
 
 
+class DeletionHistoryChangeList(ChangeList):
+    """Changelist that resolves every row's related object in bulk."""
+    
+    def get_results(self, request):
+        super().get_results(request)
+        DeletionHistory.resolve_objects(self.result_list)
+
+
 @admin.register(DeletionHistory)
 class DeletionHistoryAdmin(admin.ModelAdmin):
     """Admin for DeletionHistory model."""
@@ -230,6 +256,10 @@ class DeletionHistoryAdmin(admin.ModelAdmin):
         return format_html('<span style="color: gray;">Object not found</span>')
     view_object_link.short_description = 'Related Object'
     
+    def get_changelist(self, request, **kwargs):
+        """Use a changelist that fetches related objects once per model."""
+        return DeletionHistoryChangeList
+    
     def has_add_permission(self, request):
         """Prevent manual creation of deletion history."""
         return False
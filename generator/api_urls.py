@@ -0,0 +1,13 @@
+"""
+URL configuration for the JSON API endpoints (mounted under api/).
+"""
+from django.urls import path
+from .auth_views import generation_status, soft_delete_generation
+from .api_views import remove_background_api, remove_background_status
+
+urlpatterns = [
+    path("remove-background/", remove_background_api, name="remove_background_api"),
+    path("remove-background/status/<str:task_id>/", remove_background_status, name="remove_background_status"),
+    path("generation-status/<str:session_id>/", generation_status, name="generation_status"),
+    path("delete/<int:generation_id>/", soft_delete_generation, name="soft_delete"),
+]
@@ -15,17 +15,16 @@ except Exception:
     AsyncResult = None
 
 from .tasks import remove_background_task
+from .utils import get_rembg_session, parse_hex_color, rembg_remove
 
 logger = logging.getLogger('generator')
 
-# Check if rembg is available on startup
-REMBG_AVAILABLE = False
-try:
-    from rembg import remove
-    REMBG_AVAILABLE = True
+# rembg is imported once, in utils; check the result on startup
+REMBG_AVAILABLE = rembg_remove is not None
+if REMBG_AVAILABLE:
     logger.info("rembg library is available")
-except ImportError as e:
-    logger.warning(f"rembg library not available: {e}. Background removal will be disabled.")
+else:
+    logger.warning("rembg library not available. Background removal will be disabled.")
 
 
 @csrf_exempt
@@ -57,8 +56,9 @@ def remove_background_api(request):
             return JsonResponse({'error': 'No image data provided'}, status=400)
         
         # Remove data URL prefix if present
-        if ',' in image_data:
-            image_data = image_data.split(',')[1]
+        comma = image_data.find(',')
+        if comma != -1:
+            image_data = image_data[comma + 1:]
         
         # Decode base64 image
         try:
@@ -92,7 +92,7 @@ def remove_background_api(request):
             if max(img.size) > max_dimension:
                 ratio = max_dimension / max(img.size)
                 new_size = (int(img.size[0] * ratio), int(img.size[1] * ratio))
-                img = img.resize(new_size, Image.LANCZOS)
+                img = img.resize(new_size, Image.BILINEAR, reducing_gap=2.0)
                 logger.info(f"Resized from {original_size} to {new_size} for faster processing")
                 
                 # Convert back to bytes
@@ -100,10 +100,8 @@ def remove_background_api(request):
                 img.save(buffer, format='PNG')
                 image_bytes = buffer.getvalue()
             
-            # Use u2net_human_seg model - faster and lighter for portraits
-            from rembg import new_session
-            session = new_session('u2net_human_seg')
-            output_bytes = remove(image_bytes, session=session)
+            # Reuse the process-wide u2net_human_seg session
+            output_bytes = rembg_remove(image_bytes, session=get_rembg_session())
             logger.info(f"Background removed, output size: {len(output_bytes)} bytes")
         except Exception as e:
             logger.error(f"rembg processing failed: {e}", exc_info=True)
@@ -120,24 +118,13 @@ def remove_background_api(request):
             return JsonResponse({'error': 'Failed to process image'}, status=500)
         
         # Convert hex color to RGB with validation
-        hex_color = bg_color.lstrip('#').strip().upper()
-        
-        # Validate hex color format
-        if len(hex_color) != 6:
-            logger.error(f"Invalid hex color format: {bg_color} (cleaned: {hex_color})")
+        bg_rgb = parse_hex_color(bg_color)
+        if bg_rgb is None:
+            logger.error(f"Invalid hex color format: {bg_color}")
             return JsonResponse({
                 'error': f'Invalid color format: {bg_color}. Expected format: #RRGGBB'
             }, status=400)
         
-        try:
-            bg_rgb = tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
-            logger.info(f"Parsed color {bg_color} to RGB: {bg_rgb}")
-        except ValueError as e:
-            logger.error(f"Failed to parse hex color {bg_color}: {e}")
-            return JsonResponse({
-                'error': f'Invalid hex color: {bg_color}. Use format #RRGGBB (e.g., #FFFFFF)'
-            }, status=400)
-        
         # Create new image with solid background
         try:
             background = Image.new("RGB", img.size, bg_rgb)
@@ -1,13 +1,15 @@
 """
 Authentication and user management views.
 """
+import uuid
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth import login, logout, authenticate
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.forms import AuthenticationForm
 from django.contrib.auth.models import User
 from django.contrib import messages
-from django.http import HttpRequest, HttpResponse, JsonResponse
+from django.http import Http404, HttpRequest, HttpResponse, JsonResponse
+from django.db import transaction
 from django.db.models import Count, Sum
 from django.views.decorators.http import require_http_methods
 from django.utils import timezone
@@ -196,31 +198,37 @@ def edit_profile(request: HttpRequest) -> HttpResponse:
                 user.last_name = last_name
                 user.email = email
                 
-                # Update or create profile
-                profile, created = UserProfile.objects.get_or_create(user=user)
-                profile.phone_number = phone_number
-                profile.street_address = street_address
-                profile.landmark = landmark
-                profile.city = city
-                profile.state = state
-                profile.postal_code = postal_code
-                profile.country = country
-                profile.save()
-                
-                # Update password if provided
-                if new_password:
-                    user.set_password(new_password)
-                    messages.success(request, 'Password updated successfully. Please login again.')
-                
-                user.save()
-                
-                # Log activity
-                AdminActivity.objects.create(
-                    action_type='admin_action',
-                    user=user,
-                    ip_address=request.META.get('REMOTE_ADDR'),
-                    details={'action': 'profile_updated', 'description': f'Updated profile: {user.username}'}
-                )
+                with transaction.atomic():
+                    # Update or create profile
+                    profile, created = UserProfile.objects.get_or_create(user=user)
+                    profile.phone_number = phone_number
+                    profile.street_address = street_address
+                    profile.landmark = landmark
+                    profile.city = city
+                    profile.state = state
+                    profile.postal_code = postal_code
+                    profile.country = country
+                    profile.save(update_fields=[
+                        'phone_number', 'street_address', 'landmark', 'city',
+                        'state', 'postal_code', 'country', 'updated_at',
+                    ])
+                    
+                    # Update password if provided
+                    user_fields = ['first_name', 'last_name', 'email']
+                    if new_password:
+                        user.set_password(new_password)
+                        user_fields.append('password')
+                        messages.success(request, 'Password updated successfully. Please login again.')
+                    
+                    user.save(update_fields=user_fields)
+                    
+                    # Log activity
+                    AdminActivity.objects.create(
+                        action_type='admin_action',
+                        user=user,
+                        ip_address=request.META.get('REMOTE_ADDR'),
+                        details={'action': 'profile_updated', 'description': f'Updated profile: {user.username}'}
+                    )
                 
                 if new_password:
                     # Re-authenticate if password changed
@@ -320,6 +328,8 @@ def admin_dashboard(request: HttpRequest) -> HttpResponse:
     
     # Calculate statistics
     today = timezone.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    # Start of the site's local day, as a range bound the timestamp index can use
+    today_start = timezone.localtime().replace(hour=0, minute=0, second=0, microsecond=0)
     
     stats = {
         'total_users': PhotoGeneration.objects.values('user').distinct().count(),
@@ -328,7 +338,7 @@ def admin_dashboard(request: HttpRequest) -> HttpResponse:
         'deleted_generations': PhotoGeneration.all_objects.filter(deleted_at__isnull=False).count(),
         'total_files_mb': (PhotoGeneration.objects.aggregate(Sum('file_size_bytes'))['file_size_bytes__sum'] or 0) / (1024 * 1024),
         'today_generations': PhotoGeneration.objects.filter(created_at__date=today.date()).count(),
-        'activity_today': AdminActivity.objects.filter(timestamp__date=today.date()).count(),
+        'activity_today': AdminActivity.objects.filter(timestamp__gte=today_start).count(),
     }
     
     # Activity breakdown
@@ -407,28 +417,29 @@ def create_user(request: HttpRequest) -> HttpResponse:
                 messages.error(request, error)
         else:
             try:
-                # Create user
-                user = User.objects.create_user(
-                    username=username,
-                    email=email,
-                    password=password,
-                    first_name=first_name,
-                    last_name=last_name,
-                    is_staff=is_staff,
-                )
-                
-                # Log admin activity
-                AdminActivity.objects.create(
-                    action_type='admin_action',
-                    user=request.user,
-                    ip_address=request.META.get('REMOTE_ADDR'),
-                    details={
-                        'action': 'user_created',
-                        'description': f'Created user: {username} ({first_name} {last_name})',
-                        'username': username,
-                        'is_staff': is_staff
-                    }
-                )
+                with transaction.atomic():
+                    # Create user
+                    user = User.objects.create_user(
+                        username=username,
+                        email=email,
+                        password=password,
+                        first_name=first_name,
+                        last_name=last_name,
+                        is_staff=is_staff,
+                    )
+                    
+                    # Log admin activity
+                    AdminActivity.objects.create(
+                        action_type='admin_action',
+                        user=request.user,
+                        ip_address=request.META.get('REMOTE_ADDR'),
+                        details={
+                            'action': 'user_created',
+                            'description': f'Created user: {username} ({first_name} {last_name})',
+                            'username': username,
+                            'is_staff': is_staff
+                        }
+                    )
                 
                 messages.success(request, f'User "{username}" created successfully!')
                 return redirect('generator:manage_users')
@@ -475,7 +486,11 @@ def manage_users(request: HttpRequest) -> HttpResponse:
 @login_required
 def generation_status(request: HttpRequest, session_id: str) -> JsonResponse:
     """Return generation status for a session."""
-    generation = get_object_or_404(PhotoGeneration.all_objects, session_id=session_id, user=request.user)
+    try:
+        session_uuid = uuid.UUID(session_id)
+    except ValueError:
+        raise Http404("Unknown session")
+    generation = get_object_or_404(PhotoGeneration.all_objects, session_id=session_uuid, user=request.user)
     return JsonResponse({
         'status': generation.status,
         'output_url': generation.output_url,
@@ -188,10 +188,7 @@ class UserProfileForm(forms.ModelForm):
             self.user.last_name = self.cleaned_data['last_name']
             self.user.email = self.cleaned_data['email']
             if commit:
-                self.user.save()
-        
-        # Mark profile as complete
-        profile.profile_complete = profile.is_complete()
+                self.user.save(update_fields=['first_name', 'last_name', 'email'])
         
         if commit:
             profile.save()
@@ -5,6 +5,7 @@ Usage: python manage.py cleanup_soft_deleted --days=30
 from django.core.management.base import BaseCommand
 from django.utils import timezone
 from django.contrib.auth.models import User
+from django.contrib.contenttypes.models import ContentType
 from datetime import timedelta
 import os
 from generator.models import PhotoGeneration, AdminActivity, SystemMaintenance
@@ -105,7 +106,7 @@ class Command(BaseCommand):
         settings.last_cleanup = timezone.now()
         settings.total_deleted_records += deleted_count
         settings.total_deleted_size_mb += total_size_mb
-        settings.save()
+        settings.save(update_fields=['last_cleanup', 'total_deleted_records', 'total_deleted_size_mb'])
 
         # Log the cleanup action
         try:
@@ -168,6 +169,7 @@ class Command(BaseCommand):
                     # Create history records before deleting
                     for obj in old_deleted:
                         DeletionHistory.objects.create(
+                            content_type=ContentType.objects.get_for_model(model_class),
                             model_name=model_name,
                             object_id=obj.pk,
                             action='hard_deleted',
@@ -0,0 +1,45 @@
+"""
+Management command to write an INT8 copy of the rembg model for CPU workers.
+Run with: python manage.py quantize_rembg_model --output /path/to/model_int8.onnx
+"""
+from django.core.management.base import BaseCommand, CommandError
+from django.conf import settings
+
+
+class Command(BaseCommand):
+    help = 'Quantize the rembg ONNX model to INT8 weights (point REMBG_MODEL_PATH at the result)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--model',
+            default=None,
+            help='rembg model to quantize (defaults to REMBG_MODEL setting)'
+        )
+        parser.add_argument(
+            '--output',
+            required=True,
+            help='Path to write the quantized ONNX model to'
+        )
+
+    def handle(self, *args, **options):
+        model_name = options['model'] or settings.REMBG_MODEL
+        output_path = options['output']
+
+        try:
+            from onnxruntime.quantization import QuantType, quantize_dynamic
+            from rembg.sessions import sessions_class
+        except ImportError as e:
+            raise CommandError(f'rembg and onnxruntime are required: {e}')
+
+        session_class = next((cls for cls in sessions_class if cls.name() == model_name), None)
+        if session_class is None:
+            raise CommandError(f'Unknown rembg model: {model_name}')
+
+        # Downloads the FP32 model on first use and returns its local path
+        source_path = session_class.download_models()
+        self.stdout.write(f'Quantizing {model_name} ({source_path})...')
+
+        quantize_dynamic(source_path, output_path, weight_type=QuantType.QInt8)
+
+        self.stdout.write(self.style.SUCCESS(f'Wrote {output_path}'))
+        self.stdout.write(f'Set REMBG_MODEL_PATH={output_path} and restart the workers to use it.')
@@ -2,11 +2,18 @@
 Management command to view deletion history.
 Usage: python manage.py view_deletion_history
 """
+from django.contrib.contenttypes.models import ContentType
+from collections import defaultdict
+from django.core.cache import cache
 from django.core.management.base import BaseCommand
+from django.db.models import Count, Q
 from generator.models import DeletionHistory
 from datetime import timedelta
 from django.utils import timezone
 
+# Seconds to keep a computed history summary in the cache
+SUMMARY_CACHE_TIMEOUT = 60
+
 
 class Command(BaseCommand):
     help = 'View deletion and restoration history'
@@ -53,7 +60,16 @@ class Command(BaseCommand):
         history = DeletionHistory.objects.filter(performed_at__gte=since_date)
         
         if model_name:
-            history = history.filter(model_name=model_name)
+            # Prefer the indexed content_type column, but keep matching rows whose
+            # content_type was never backfilled, and fall back to the plain
+            # model_name filter for models outside the generator app
+            name_filter = Q(content_type__isnull=True, model_name=model_name)
+            try:
+                content_type = ContentType.objects.get_by_natural_key('generator', model_name.lower())
+            except ContentType.DoesNotExist:
+                history = history.filter(model_name=model_name)
+            else:
+                history = history.filter(Q(content_type=content_type) | name_filter)
         
         if action:
             history = history.filter(action=action)
@@ -61,7 +77,32 @@ class Command(BaseCommand):
         if username:
             history = history.filter(performed_by__username=username)
         
-        count = history.count()
+        # Summaries change slowly, so cache them briefly; the version is bumped
+        # whenever a new history record is written
+        cache_key = (
+            f'delhist:{DeletionHistory.get_summary_cache_version()}:'
+            f'{days}:{model_name or ""}:{action or ""}:{username or ""}'
+        )
+        summary = cache.get(cache_key)
+        if summary is None:
+            # Action and model breakdown from a single GROUP BY (action, model_name);
+            # the grand total is rolled up from it, so no separate COUNT is needed
+            actions_summary = defaultdict(int)
+            models_summary = defaultdict(int)
+            for item in history.values('action', 'model_name').annotate(count=Count('id')).order_by():
+                actions_summary[item['action']] += item['count']
+                models_summary[item['model_name']] += item['count']
+            
+            summary = {
+                'count': sum(actions_summary.values()),
+                'actions': dict(actions_summary),
+                'models': dict(models_summary),
+            }
+            cache.set(cache_key, summary, SUMMARY_CACHE_TIMEOUT)
+        
+        count = summary['count']
+        actions_summary = summary['actions']
+        models_summary = summary['models']
         
         if count == 0:
             self.stdout.write(self.style.WARNING('No deletion history found for the specified criteria'))
@@ -71,25 +112,13 @@ class Command(BaseCommand):
         self.stdout.write(self.style.SUCCESS(f'\n📊 Deletion History Summary (Last {days} days)'))
         self.stdout.write(f'Total records: {count}\n')
         
-        # Action breakdown
-        actions_summary = history.values('action').annotate(
-            count=models.Count('id')
-        ).order_by('-count')
-        
-        from django.db import models
-        
         self.stdout.write('Actions:')
-        for item in actions_summary:
-            self.stdout.write(f'  {item["action"]}: {item["count"]}')
-        
-        # Model breakdown
-        models_summary = history.values('model_name').annotate(
-            count=models.Count('id')
-        ).order_by('-count')
+        for action_name, action_count in sorted(actions_summary.items(), key=lambda kv: -kv[1]):
+            self.stdout.write(f'  {action_name}: {action_count}')
         
         self.stdout.write('\nModels:')
-        for item in models_summary:
-            self.stdout.write(f'  {item["model_name"]}: {item["count"]}')
+        for name, model_count in sorted(models_summary.items(), key=lambda kv: -kv[1]):
+            self.stdout.write(f'  {name}: {model_count}')
         
         # Recent history
         self.stdout.write(f'\n📜 Recent History (showing up to {limit} records):\n')
@@ -100,7 +129,12 @@ class Command(BaseCommand):
             'hard_deleted': '⚠️',
         }
         
-        for record in history[:limit]:
+        recent = history.select_related('performed_by').only(
+            'model_name', 'object_id', 'action', 'performed_at', 'reason', 'performed_by__username',
+        ).order_by('-performed_at')[:limit]
+        
+        # Stream rows in chunks so large --limit values don't materialize the whole slice
+        for record in recent.iterator(chunk_size=2000):
             icon = action_icons.get(record.action, '•')
             user_str = record.performed_by.username if record.performed_by else 'System'
             
@@ -41,3 +41,21 @@ class RequestLoggingMiddleware:
             exc_info=True
         )
         return None
+
+
+class GenerationAuditMiddleware:
+    """Middleware to write a request's queued GenerationAudit entries in one batch."""
+    
+    def __init__(self, get_response):
+        self.get_response = get_response
+    
+    def __call__(self, request):
+        from .models import GenerationAudit
+        
+        try:
+            return self.get_response(request)
+        finally:
+            try:
+                GenerationAudit.flush()
+            except Exception as e:
+                logger.error(f"Failed to write generation audit entries: {e}", exc_info=True)
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-15 22:28
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_content_type(apps, schema_editor):
+    ContentType = apps.get_model('contenttypes', 'ContentType')
+    DeletionHistory = apps.get_model('generator', 'DeletionHistory')
+    model_names = DeletionHistory.objects.values_list('model_name', flat=True).distinct()
+    for model_name in model_names:
+        content_type, _ = ContentType.objects.get_or_create(
+            app_label='generator', model=model_name.lower()
+        )
+        DeletionHistory.objects.filter(model_name=model_name).update(content_type=content_type)
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('generator', '0008_photogeneration_error_message_photogeneration_status_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='deletionhistory',
+            name='content_type',
+            field=models.ForeignKey(blank=True, help_text='Content type of the model that was deleted/restored', null=True, on_delete=django.db.models.deletion.CASCADE, to='contenttypes.contenttype'),
+        ),
+        migrations.AddIndex(
+            model_name='deletionhistory',
+            index=models.Index(fields=['content_type', 'object_id', '-performed_at'], name='generator_d_content_5315cf_idx'),
+        ),
+        migrations.RunPython(backfill_content_type, migrations.RunPython.noop),
+    ]
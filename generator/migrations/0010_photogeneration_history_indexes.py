@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-15 22:31
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('generator', '0009_deletionhistory_content_type'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='photogeneration',
+            index=models.Index(condition=models.Q(('status', 'completed')), fields=['user', '-created_at'], name='pg_user_completed_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='photogeneration',
+            index=models.Index(fields=['user', '-created_at'], include=('output_type', 'file_size_bytes', 'output_url'), name='pg_user_cover_idx'),
+        ),
+    ]
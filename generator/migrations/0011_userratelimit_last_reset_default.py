@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-15 22:32
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('generator', '0010_photogeneration_history_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='userratelimit',
+            name='last_reset',
+            field=models.DateTimeField(default=django.utils.timezone.now, help_text='Last time counter was reset'),
+        ),
+    ]
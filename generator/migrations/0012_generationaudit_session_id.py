@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-15 22:36
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def backfill_session_id(apps, schema_editor):
+    GenerationAudit = apps.get_model('generator', 'GenerationAudit')
+    PhotoGeneration = apps.get_model('generator', 'PhotoGeneration')
+    GenerationAudit.objects.filter(session_id='').update(
+        session_id=Subquery(
+            PhotoGeneration.objects.filter(pk=OuterRef('generation_id')).values('session_id')[:1]
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('generator', '0011_userratelimit_last_reset_default'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='generationaudit',
+            name='session_id',
+            field=models.CharField(blank=True, default='', help_text='Session ID of the generation (copied to avoid a join)', max_length=64),
+        ),
+        migrations.AddIndex(
+            model_name='generationaudit',
+            index=models.Index(fields=['session_id', '-timestamp'], name='generator_g_session_4428be_idx'),
+        ),
+        migrations.RunPython(backfill_session_id, migrations.RunPython.noop),
+    ]
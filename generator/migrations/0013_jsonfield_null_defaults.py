@@ -0,0 +1,45 @@
+# Generated by Django 5.2.18 on 2026-10-15 22:37
+
+from django.db import migrations, models
+
+
+def null_empty_json(apps, schema_editor):
+    for model_name, field in (
+        ('AdminActivity', 'details'),
+        ('DeletionHistory', 'metadata'),
+        ('FeatureUsage', 'metadata'),
+        ('GenerationAudit', 'details'),
+    ):
+        Model = apps.get_model('generator', model_name)
+        Model.objects.filter(**{field: {}}).update(**{field: None})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('generator', '0012_generationaudit_session_id'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='adminactivity',
+            name='details',
+            field=models.JSONField(blank=True, default=None, null=True),
+        ),
+        migrations.AlterField(
+            model_name='deletionhistory',
+            name='metadata',
+            field=models.JSONField(blank=True, default=None, help_text='Additional metadata about the action', null=True),
+        ),
+        migrations.AlterField(
+            model_name='featureusage',
+            name='metadata',
+            field=models.JSONField(blank=True, default=None, help_text='Additional feature-specific data', null=True),
+        ),
+        migrations.AlterField(
+            model_name='generationaudit',
+            name='details',
+            field=models.JSONField(blank=True, default=None, help_text='Additional details about the action', null=True),
+        ),
+        migrations.RunPython(null_empty_json, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-15 22:37
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('generator', '0013_jsonfield_null_defaults'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        # A stored column cannot be altered into a generated one, so replace it
+        migrations.RemoveField(
+            model_name='userprofile',
+            name='profile_complete',
+        ),
+        migrations.AddField(
+            model_name='userprofile',
+            name='profile_complete',
+            field=models.GeneratedField(db_persist=True, expression=models.Q(('date_of_birth__isnull', False), models.Q(('phone_number', ''), _negated=True), models.Q(('street_address', ''), _negated=True), models.Q(('city', ''), _negated=True), models.Q(('state', ''), _negated=True), models.Q(('postal_code', ''), _negated=True), models.Q(('country', ''), _negated=True)), help_text='Whether profile has all required fields (computed by the database)', output_field=models.BooleanField()),
+        ),
+        migrations.AddIndex(
+            model_name='userprofile',
+            index=models.Index(condition=models.Q(('profile_complete', True)), fields=['profile_complete'], name='profile_complete_idx'),
+        ),
+    ]
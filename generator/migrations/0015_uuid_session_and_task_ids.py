@@ -0,0 +1,68 @@
+# Generated by Django 5.2.18 on 2026-10-15 22:42
+
+import uuid
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def _to_hex(value):
+    try:
+        return uuid.UUID(value).hex
+    except (TypeError, ValueError):
+        return None
+
+
+def normalize_ids(apps, schema_editor):
+    """Rewrite identifiers as plain UUID hex so every backend can convert them."""
+    PhotoGeneration = apps.get_model('generator', 'PhotoGeneration')
+    GenerationAudit = apps.get_model('generator', 'GenerationAudit')
+
+    for generation in PhotoGeneration.objects.only('session_id', 'task_id').iterator(chunk_size=2000):
+        session_id = _to_hex(generation.session_id) or uuid.uuid4().hex
+        task_id = _to_hex(generation.task_id)
+        if (session_id, task_id) != (generation.session_id, generation.task_id):
+            PhotoGeneration.objects.filter(pk=generation.pk).update(session_id=session_id, task_id=task_id)
+
+    GenerationAudit.objects.filter(session_id='').update(session_id=None)
+    for audit in GenerationAudit.objects.exclude(session_id=None).only('session_id').iterator(chunk_size=2000):
+        session_id = _to_hex(audit.session_id)
+        if session_id != audit.session_id:
+            GenerationAudit.objects.filter(pk=audit.pk).update(session_id=session_id)
+
+    # Re-copy from the (now normalized) generation where the audit copy was unusable
+    GenerationAudit.objects.filter(session_id=None).update(
+        session_id=Subquery(
+            PhotoGeneration.objects.filter(pk=OuterRef('generation_id')).values('session_id')[:1]
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('generator', '0014_userprofile_profile_complete_generated'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='generationaudit',
+            name='session_id',
+            field=models.CharField(blank=True, max_length=64, null=True),
+        ),
+        migrations.RunPython(normalize_ids, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='generationaudit',
+            name='session_id',
+            field=models.UUIDField(blank=True, help_text='Session ID of the generation (copied to avoid a join)', null=True),
+        ),
+        migrations.AlterField(
+            model_name='photogeneration',
+            name='session_id',
+            field=models.UUIDField(default=uuid.uuid4, editable=False, help_text='Unique session identifier', unique=True),
+        ),
+        migrations.AlterField(
+            model_name='photogeneration',
+            name='task_id',
+            field=models.UUIDField(blank=True, help_text='Background task ID (Celery)', null=True),
+        ),
+    ]
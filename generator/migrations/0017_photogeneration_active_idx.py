@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-15 22:48
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('generator', '0016_userprofile_phone_digits_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='photogeneration',
+            name='status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('processing', 'Processing'), ('completed', 'Completed'), ('failed', 'Failed')], default='completed', help_text='Processing status', max_length=20),
+        ),
+        migrations.AddIndex(
+            model_name='photogeneration',
+            index=models.Index(condition=models.Q(('status__in', ['pending', 'processing'])), fields=['status', 'created_at'], name='pg_active_idx'),
+        ),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 5.2.18 on 2026-10-15 22:48
+
+from django.db import migrations, models
+
+# Append-only, time-ordered columns: BRIN indexes are tiny and cheap to maintain
+BRIN_INDEXES = [
+    ('fu_ts_brin', 'generator_featureusage', 'timestamp'),
+    ('aa_ts_brin', 'generator_adminactivity', 'timestamp'),
+    ('dh_performed_at_brin', 'generator_deletionhistory', 'performed_at'),
+]
+
+
+def create_brin_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name, table, column in BRIN_INDEXES:
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS {name} ON {table} USING BRIN ({column}) '
+            f'WITH (pages_per_range = 32)'
+        )
+
+
+def drop_brin_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name, table, column in BRIN_INDEXES:
+        schema_editor.execute(f'DROP INDEX IF EXISTS {name}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('generator', '0017_photogeneration_active_idx'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='adminactivity',
+            name='timestamp',
+            field=models.DateTimeField(auto_now_add=True),
+        ),
+        migrations.AlterField(
+            model_name='deletionhistory',
+            name='performed_at',
+            field=models.DateTimeField(auto_now_add=True, help_text='When the action was performed'),
+        ),
+        migrations.AlterField(
+            model_name='featureusage',
+            name='timestamp',
+            field=models.DateTimeField(auto_now_add=True, help_text='When the feature was used'),
+        ),
+        migrations.RunPython(create_brin_indexes, drop_brin_indexes),
+    ]
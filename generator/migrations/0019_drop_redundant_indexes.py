@@ -0,0 +1,97 @@
+# Generated by Django 5.2.18 on 2026-10-15 22:50
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('generator', '0018_timestamp_brin_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='photoconfiguration',
+            name='generator_p_generat_d7e334_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='photogeneration',
+            name='generator_p_user_id_4c577a_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='photogeneration',
+            name='generator_p_session_f952b0_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='userprofile',
+            name='generator_u_user_id_b3cb9c_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='userprofile',
+            name='generator_u_created_eed4f2_idx',
+        ),
+        migrations.AlterField(
+            model_name='adminactivity',
+            name='user',
+            field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='activities', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AlterField(
+            model_name='deletionhistory',
+            name='action',
+            field=models.CharField(choices=[('deleted', 'Soft Deleted'), ('restored', 'Restored'), ('hard_deleted', 'Permanently Deleted')], help_text='Action performed (deleted/restored/hard_deleted)', max_length=20),
+        ),
+        migrations.AlterField(
+            model_name='deletionhistory',
+            name='content_type',
+            field=models.ForeignKey(blank=True, db_index=False, help_text='Content type of the model that was deleted/restored', null=True, on_delete=django.db.models.deletion.CASCADE, to='contenttypes.contenttype'),
+        ),
+        migrations.AlterField(
+            model_name='deletionhistory',
+            name='model_name',
+            field=models.CharField(help_text='Name of the model that was deleted/restored', max_length=100),
+        ),
+        migrations.AlterField(
+            model_name='deletionhistory',
+            name='performed_by',
+            field=models.ForeignKey(blank=True, db_index=False, help_text='User who performed the action', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='deletion_actions', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AlterField(
+            model_name='featureusage',
+            name='feature',
+            field=models.CharField(help_text="Feature name (e.g., 'crop', 'batch_upload', 'export_pdf')", max_length=50),
+        ),
+        migrations.AlterField(
+            model_name='featureusage',
+            name='user',
+            field=models.ForeignKey(blank=True, db_index=False, help_text='User using the feature', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='feature_usage', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AlterField(
+            model_name='generationaudit',
+            name='action',
+            field=models.CharField(choices=[('created', 'Created'), ('downloaded', 'Downloaded'), ('deleted', 'Deleted'), ('expired', 'Expired & Cleaned'), ('failed', 'Failed')], help_text='Action performed', max_length=20),
+        ),
+        migrations.AlterField(
+            model_name='generationaudit',
+            name='generation',
+            field=models.ForeignKey(db_index=False, help_text='Generation this audit entry relates to', on_delete=django.db.models.deletion.CASCADE, related_name='audit_logs', to='generator.photogeneration'),
+        ),
+        migrations.AlterField(
+            model_name='generationaudit',
+            name='user',
+            field=models.ForeignKey(blank=True, db_index=False, help_text='User who performed the action', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='generation_audits', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AlterField(
+            model_name='photoconfiguration',
+            name='generation',
+            field=models.ForeignKey(db_index=False, help_text='Generation this photo belongs to', on_delete=django.db.models.deletion.CASCADE, related_name='photo_configs', to='generator.photogeneration'),
+        ),
+        migrations.AlterField(
+            model_name='photogeneration',
+            name='user',
+            field=models.ForeignKey(blank=True, db_index=False, help_text='User who generated the photos (null for anonymous)', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='photo_generations', to=settings.AUTH_USER_MODEL),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-15 23:17
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('generator', '0019_drop_redundant_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='photogeneration',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['user', '-created_at'], name='pg_live_idx'),
+        ),
+    ]
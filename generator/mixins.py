@@ -1,13 +1,17 @@
 """
 Soft delete mixins and managers for models.
 """
-from django.db import models
+from django.contrib.contenttypes.models import ContentType
+from django.db import models, transaction
 from django.utils import timezone
 
 
 class SoftDeleteManager(models.Manager):
     """
     Manager that excludes soft-deleted objects by default.
+    
+    Connections may be pooled in transaction mode, so large scans should use
+    .iterator(chunk_size=...) and must not sit inside long atomic blocks.
     """
     def get_queryset(self):
         """Only return non-deleted objects by default."""
@@ -20,6 +24,56 @@ class SoftDeleteManager(models.Manager):
     def only_deleted(self):
         """Only return soft-deleted objects."""
         return super().get_queryset().filter(deleted_at__isnull=False)
+    
+    def bulk_soft_delete(self, queryset=None, deleted_by=None, reason=''):
+        """
+        Soft delete many objects with one UPDATE and batched history inserts.
+        
+        History rows are written with bulk_create, so post_save handlers do not
+        run and their metadata carries only the deletion timestamp.
+        
+        Args:
+            queryset: Objects to delete (defaults to every non-deleted object)
+            deleted_by: User performing the deletion
+            reason: Reason for deletion
+        
+        Returns:
+            Number of objects soft-deleted
+        """
+        from .models import DeletionHistory
+        
+        if queryset is None:
+            queryset = self.get_queryset()
+        
+        now = timezone.now()
+        with transaction.atomic(using=self.db):
+            pks = list(queryset.filter(deleted_at__isnull=True).values_list('pk', flat=True))
+            if not pks:
+                return 0
+            
+            super().get_queryset().filter(pk__in=pks).update(
+                deleted_at=now,
+                deleted_by=deleted_by,
+                deletion_reason=reason,
+            )
+            
+            content_type = ContentType.objects.get_for_model(self.model)
+            metadata = {'deleted_at': now.isoformat()}
+            DeletionHistory.objects.bulk_create([
+                DeletionHistory(
+                    content_type=content_type,
+                    model_name=self.model.__name__,
+                    object_id=pk,
+                    action='deleted',
+                    performed_by=deleted_by,
+                    reason=reason,
+                    metadata=metadata,
+                )
+                for pk in pks
+            ], batch_size=1000)
+        
+        DeletionHistory.bump_summary_cache_version()
+        return len(pks)
 
 
 class SoftDeleteMixin(models.Model):
@@ -82,10 +136,11 @@ class SoftDeleteMixin(models.Model):
             self.deleted_at = timezone.now()
             self.deleted_by = deleted_by
             self.deletion_reason = reason
-            self.save(using=using)
-            
-            # Create deletion history record
-            self._create_deletion_history(deleted_by, reason)
+            with transaction.atomic(using=using):
+                self.save(using=using, update_fields=['deleted_at', 'deleted_by', 'deletion_reason'])
+                
+                # Create deletion history record
+                self._create_deletion_history(deleted_by, reason)
     
     def restore(self, restored_by=None, reason=''):
         """
@@ -101,10 +156,11 @@ class SoftDeleteMixin(models.Model):
         self.deleted_at = None
         self.deleted_by = None
         self.deletion_reason = ''
-        self.save()
-        
-        # Create restoration history record
-        self._create_restoration_history(restored_by, reason)
+        with transaction.atomic():
+            self.save(update_fields=['deleted_at', 'deleted_by', 'deletion_reason'])
+            
+            # Create restoration history record
+            self._create_restoration_history(restored_by, reason)
     
     def hard_delete(self):
         """
@@ -120,6 +176,7 @@ class SoftDeleteMixin(models.Model):
         """Create a history record for deletion."""
         from .models import DeletionHistory
         DeletionHistory.objects.create(
+            content_type=ContentType.objects.get_for_model(self.__class__),
             model_name=self.__class__.__name__,
             object_id=self.pk,
             action='deleted',
@@ -135,6 +192,7 @@ class SoftDeleteMixin(models.Model):
         """Create a history record for restoration."""
         from .models import DeletionHistory
         DeletionHistory.objects.create(
+            content_type=ContentType.objects.get_for_model(self.__class__),
             model_name=self.__class__.__name__,
             object_id=self.pk,
             action='restored',
@@ -1,13 +1,124 @@
 """
 Models for passport photo generator with user authentication and enhanced profile management.
 """
-from django.db import models
+import threading
+import uuid
+from types import MappingProxyType
+from django.db import models, transaction
+from django.db.models import F, Q, Value
+from django.db.models.functions import Replace
 from django.contrib.auth.models import User
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
 from django.utils import timezone
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.db.models.signals import post_save
 from django.dispatch import receiver
-from .mixins import SoftDeleteMixin
+from .config import PHOTO_SIZES
+from .mixins import SoftDeleteManager, SoftDeleteMixin
+
+# Preset photo dimensions (width_cm, height_cm), resolved once at import
+_SIZE_MAP = MappingProxyType({
+    key: (size["width"], size["height"]) for key, size in PHOTO_SIZES.items()
+})
+
+_FILE_SIZE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB')
+
+
+class Country(models.TextChoices):
+    """Countries supported for user addresses."""
+    IN = 'IN', 'India'
+    US = 'US', 'United States'
+    UK = 'UK', 'United Kingdom'
+    CA = 'CA', 'Canada'
+    AU = 'AU', 'Australia'
+    OTHER = 'OTHER', 'Other'
+
+
+class State(models.TextChoices):
+    """Indian states and union territories for user addresses."""
+    UNSELECTED = '', '-- Select State --'
+    AP = 'AP', 'Andhra Pradesh'
+    AR = 'AR', 'Arunachal Pradesh'
+    AS = 'AS', 'Assam'
+    BR = 'BR', 'Bihar'
+    CG = 'CG', 'Chhattisgarh'
+    GA = 'GA', 'Goa'
+    GJ = 'GJ', 'Gujarat'
+    HR = 'HR', 'Haryana'
+    HP = 'HP', 'Himachal Pradesh'
+    JK = 'JK', 'Jammu & Kashmir'
+    JH = 'JH', 'Jharkhand'
+    KA = 'KA', 'Karnataka'
+    KL = 'KL', 'Kerala'
+    MP = 'MP', 'Madhya Pradesh'
+    MH = 'MH', 'Maharashtra'
+    MN = 'MN', 'Manipur'
+    ML = 'ML', 'Meghalaya'
+    MZ = 'MZ', 'Mizoram'
+    NL = 'NL', 'Nagaland'
+    OD = 'OD', 'Odisha'
+    PB = 'PB', 'Punjab'
+    RJ = 'RJ', 'Rajasthan'
+    SK = 'SK', 'Sikkim'
+    TN = 'TN', 'Tamil Nadu'
+    TS = 'TS', 'Telangana'
+    TR = 'TR', 'Tripura'
+    UP = 'UP', 'Uttar Pradesh'
+    UK = 'UK', 'Uttarakhand'
+    WB = 'WB', 'West Bengal'
+    DL = 'DL', 'Delhi'
+
+
+class GenerationStatus(models.TextChoices):
+    """Processing status of a photo generation."""
+    PENDING = 'pending', 'Pending'
+    PROCESSING = 'processing', 'Processing'
+    COMPLETED = 'completed', 'Completed'
+    FAILED = 'failed', 'Failed'
+
+
+# Statuses of generations that have not finished yet
+ACTIVE_STATUSES = [GenerationStatus.PENDING.value, GenerationStatus.PROCESSING.value]
+
+
+class PhotoSize(models.TextChoices):
+    """Photo size presets (dimensions live in generator.config.PHOTO_SIZES)."""
+    PASSPORT_35X45 = 'passport_35x45', 'Passport (3.5×4.5 cm)'
+    PASSPORT_SMALL = 'passport_small', 'Small Passport (2.5×3.5 cm)'
+    ID_CARD = 'id_card', 'ID Card (3.0×4.0 cm)'
+    VISA_3X4 = 'visa_3x4', 'Visa (3.0×4.0 cm)'
+    VISA_4X6 = 'visa_4x6', 'Visa Large (4.0×6.0 cm)'
+    UK_VISA = 'uk_visa', 'UK Visa (4.45×5.59 cm)'
+    US_VISA = 'us_visa', 'US Passport (5.0×5.0 cm)'
+    SCHENGEN = 'schengen', 'Schengen (3.5×4.5 cm)'
+    AUSTRALIA = 'australia', 'Australia (4.5×5.5 cm)'
+    CANADA = 'canada', 'Canada (3.5×4.5 cm)'
+    CUSTOM = 'custom', 'Custom Size'
+
+
+# Formatting characters stripped from phone numbers for digit-only lookups
+_PHONE_SEPARATORS = ('+', ' ', '-', '(', ')', '.')
+
+
+def phone_digits(expression):
+    """Build an expression stripping formatting characters from a phone number."""
+    for separator in _PHONE_SEPARATORS:
+        expression = Replace(expression, Value(separator), Value(''))
+    return expression
+
+
+class UserProfileQuerySet(models.QuerySet):
+    """QuerySet helpers for UserProfile lookups."""
+    
+    def filter_phone(self, number):
+        """
+        Match profiles by phone number regardless of formatting.
+        
+        Uses the same expression as the up_phone_digits_idx functional index.
+        """
+        digits = ''.join(ch for ch in number if ch.isdigit())
+        return self.alias(phone_digits=phone_digits(F('phone_number'))).filter(phone_digits=digits)
 
 
 class UserProfile(models.Model):
@@ -15,49 +126,6 @@ class UserProfile(models.Model):
     Enhanced user profile with comprehensive address and personal information.
     Mandatory for all users.
     """
-    COUNTRY_CHOICES = [
-        ('IN', 'India'),
-        ('US', 'United States'),
-        ('UK', 'United Kingdom'),
-        ('CA', 'Canada'),
-        ('AU', 'Australia'),
-        ('OTHER', 'Other'),
-    ]
-    
-    STATE_CHOICES = [
-        ('', '-- Select State --'),
-        ('AP', 'Andhra Pradesh'),
-        ('AR', 'Arunachal Pradesh'),
-        ('AS', 'Assam'),
-        ('BR', 'Bihar'),
-        ('CG', 'Chhattisgarh'),
-        ('GA', 'Goa'),
-        ('GJ', 'Gujarat'),
-        ('HR', 'Haryana'),
-        ('HP', 'Himachal Pradesh'),
-        ('JK', 'Jammu & Kashmir'),
-        ('JH', 'Jharkhand'),
-        ('KA', 'Karnataka'),
-        ('KL', 'Kerala'),
-        ('MP', 'Madhya Pradesh'),
-        ('MH', 'Maharashtra'),
-        ('MN', 'Manipur'),
-        ('ML', 'Meghalaya'),
-        ('MZ', 'Mizoram'),
-        ('NL', 'Nagaland'),
-        ('OD', 'Odisha'),
-        ('PB', 'Punjab'),
-        ('RJ', 'Rajasthan'),
-        ('SK', 'Sikkim'),
-        ('TN', 'Tamil Nadu'),
-        ('TS', 'Telangana'),
-        ('TR', 'Tripura'),
-        ('UP', 'Uttar Pradesh'),
-        ('UK', 'Uttarakhand'),
-        ('WB', 'West Bengal'),
-        ('DL', 'Delhi'),
-    ]
-    
     user = models.OneToOneField(
         User,
         on_delete=models.CASCADE,
@@ -103,7 +171,7 @@ class UserProfile(models.Model):
     
     state = models.CharField(
         max_length=50,
-        choices=STATE_CHOICES,
+        choices=State.choices,
         blank=True,
         default='',
         help_text="State/Province"
@@ -118,15 +186,23 @@ class UserProfile(models.Model):
     
     country = models.CharField(
         max_length=50,
-        choices=COUNTRY_CHOICES,
-        default='IN',
+        choices=Country.choices,
+        default=Country.IN,
         help_text="Country"
     )
     
     # Profile Metadata
-    profile_complete = models.BooleanField(
-        default=False,
-        help_text="Whether profile has all required fields"
+    profile_complete = models.GeneratedField(
+        expression=Q(date_of_birth__isnull=False)
+        & ~Q(phone_number='')
+        & ~Q(street_address='')
+        & ~Q(city='')
+        & ~Q(state='')
+        & ~Q(postal_code='')
+        & ~Q(country=''),
+        output_field=models.BooleanField(),
+        db_persist=True,
+        help_text="Whether profile has all required fields (computed by the database)"
     )
     
     created_at = models.DateTimeField(
@@ -140,13 +216,19 @@ class UserProfile(models.Model):
         help_text="Last profile update"
     )
     
+    objects = UserProfileQuerySet.as_manager()
+    
     class Meta:
         ordering = ['-created_at']
         indexes = [
-            models.Index(fields=['user']),
-            models.Index(fields=['created_at']),
             models.Index(fields=['postal_code']),
             models.Index(fields=['country', 'state']),
+            models.Index(
+                fields=['profile_complete'],
+                condition=Q(profile_complete=True),
+                name='profile_complete_idx',
+            ),
+            models.Index(phone_digits(F('phone_number')), name='up_phone_digits_idx'),
         ]
     
     def __str__(self):
@@ -155,19 +237,30 @@ class UserProfile(models.Model):
     def get_full_address(self):
         """Return formatted full address."""
         return f"{self.street_address}, {self.city}, {self.state} {self.postal_code}, {self.country}"
-    
-    def is_complete(self):
-        """Check if all required fields are filled."""
-        required_fields = [
-            self.date_of_birth,
-            self.phone_number,
-            self.street_address,
-            self.city,
-            self.state,
-            self.postal_code,
-            self.country,
-        ]
-        return all(required_fields)
+
+
+class PhotoGenerationQuerySet(models.QuerySet):
+    """QuerySet helpers for PhotoGeneration listings."""
+    
+    def with_related(self):
+        """
+        Fetch the user and prefetch photo configs and audit logs in bulk.
+        Avoids N+1 queries in list views that traverse these relations.
+        """
+        return self.select_related('user').prefetch_related(
+            models.Prefetch(
+                'photo_configs',
+                queryset=PhotoConfiguration.objects.only(
+                    'id', 'generation_id', 'photo_index', 'photo_size', 'copies',
+                    'custom_width_cm', 'custom_height_cm',
+                ),
+            ),
+            'audit_logs',
+        )
+    
+    def active(self):
+        """Generations still queued or running, oldest first (served by pg_active_idx)."""
+        return self.filter(status__in=ACTIVE_STATUSES).order_by('created_at')
 
 
 class PhotoGeneration(SoftDeleteMixin, models.Model):
@@ -182,12 +275,14 @@ class PhotoGeneration(SoftDeleteMixin, models.Model):
         related_name='photo_generations',
         null=True,
         blank=True,
+        db_index=False,  # covered by the composite indexes in Meta
         help_text="User who generated the photos (null for anonymous)"
     )
     
-    session_id = models.CharField(
-        max_length=64,
+    session_id = models.UUIDField(
         unique=True,
+        default=uuid.uuid4,
+        editable=False,
         help_text="Unique session identifier"
     )
     
@@ -232,23 +327,14 @@ class PhotoGeneration(SoftDeleteMixin, models.Model):
         help_text="Public URL to download file"
     )
 
-    STATUS_CHOICES = [
-        ('pending', 'Pending'),
-        ('processing', 'Processing'),
-        ('completed', 'Completed'),
-        ('failed', 'Failed'),
-    ]
-
     status = models.CharField(
         max_length=20,
-        choices=STATUS_CHOICES,
-        default='completed',
-        db_index=True,
+        choices=GenerationStatus.choices,
+        default=GenerationStatus.COMPLETED,
         help_text="Processing status"
     )
 
-    task_id = models.CharField(
-        max_length=255,
+    task_id = models.UUIDField(
         null=True,
         blank=True,
         help_text="Background task ID (Celery)"
@@ -272,16 +358,43 @@ class PhotoGeneration(SoftDeleteMixin, models.Model):
         help_text="Total number of photo copies in output"
     )
     
+    objects = SoftDeleteManager.from_queryset(PhotoGenerationQuerySet)()
+    all_objects = PhotoGenerationQuerySet.as_manager()
+    
     class Meta:
         ordering = ['-created_at']
         indexes = [
-            models.Index(fields=['user', '-created_at']),
-            models.Index(fields=['session_id']),
+            # Partial index for completed-history listings (PostgreSQL/SQLite)
+            models.Index(
+                fields=['user', '-created_at'],
+                condition=Q(status='completed'),
+                name='pg_user_completed_idx',
+            ),
+            # Covering index so history rows can be served by an index-only scan (PostgreSQL);
+            # also serves every plain (user, -created_at) lookup
+            models.Index(
+                fields=['user', '-created_at'],
+                include=['output_type', 'file_size_bytes', 'output_url'],
+                name='pg_user_cover_idx',
+            ),
+            # Partial index matching the default manager's deleted_at IS NULL filter;
+            # soft-deleted rows stay out of it (deleted_at itself is indexed by the mixin)
+            models.Index(
+                fields=['user', '-created_at'],
+                condition=Q(deleted_at__isnull=True),
+                name='pg_live_idx',
+            ),
+            # Partial index for the worker/dashboard scan of unfinished generations
+            models.Index(
+                fields=['status', 'created_at'],
+                condition=Q(status__in=ACTIVE_STATUSES),
+                name='pg_active_idx',
+            ),
         ]
     
     def __str__(self):
         user_str = self.user.username if self.user else 'Anonymous'
-        return f"{user_str} - {self.output_type} - {self.created_at.strftime('%Y-%m-%d %H:%M')}"
+        return f"{user_str} - {self.output_type} - {self.created_at:%Y-%m-%d %H:%M}"
     
     def get_age_display(self):
         """Get human-readable age of generation."""
@@ -290,15 +403,13 @@ class PhotoGeneration(SoftDeleteMixin, models.Model):
     
     def get_file_size_display(self):
         """Get human-readable file size."""
-        if not self.file_size_bytes:
+        size = self.file_size_bytes
+        if not size:
             return "Unknown"
         
-        size = self.file_size_bytes
-        for unit in ['B', 'KB', 'MB', 'GB']:
-            if size < 1024.0:
-                return f'{size:.1f} {unit}'
-            size /= 1024.0
-        return f'{size:.1f} TB'
+        # Unit index is floor(log1024(size)), read straight off the bit length
+        unit = min((size.bit_length() - 1) // 10, len(_FILE_SIZE_UNITS) - 1)
+        return f'{size / (1 << (10 * unit)):.1f} {_FILE_SIZE_UNITS[unit]}'
 
 
 class UserRateLimit(models.Model):
@@ -325,7 +436,7 @@ class UserRateLimit(models.Model):
     )
     
     last_reset = models.DateTimeField(
-        auto_now=True,
+        default=timezone.now,
         help_text="Last time counter was reset"
     )
     
@@ -359,14 +470,28 @@ class UserRateLimit(models.Model):
         return f"{self.user.username} - Generations: {self.generations_today}"
     
     def reset_if_needed(self):
-        """Reset counters if 24 hours have passed."""
-        from django.utils import timezone
+        """
+        Reset counters if 24 hours have passed.
+        
+        Done as a single conditional UPDATE so concurrent workers cannot both
+        observe an expired window and reset it twice.
+        
+        Returns:
+            True if the counters were reset, False otherwise
+        """
         from datetime import timedelta
         
-        if timezone.now() - self.last_reset > timedelta(hours=24):
+        now = timezone.now()
+        reset = UserRateLimit.objects.filter(
+            pk=self.pk,
+            last_reset__lt=now - timedelta(hours=24),
+        ).update(generations_today=0, total_size_today_mb=0.0, last_reset=now)
+        
+        if reset:
             self.generations_today = 0
             self.total_size_today_mb = 0.0
-            self.save()
+            self.last_reset = now
+        return bool(reset)
 
 
 class GenerationAudit(SoftDeleteMixin, models.Model):
@@ -387,22 +512,29 @@ class GenerationAudit(SoftDeleteMixin, models.Model):
         PhotoGeneration,
         on_delete=models.CASCADE,
         related_name='audit_logs',
+        db_index=False,  # covered by the composite indexes in Meta
         help_text="Generation this audit entry relates to"
     )
     
+    session_id = models.UUIDField(
+        null=True,
+        blank=True,
+        help_text="Session ID of the generation (copied to avoid a join)"
+    )
+    
     user = models.ForeignKey(
         User,
         on_delete=models.SET_NULL,
         null=True,
         blank=True,
         related_name='generation_audits',
+        db_index=False,  # covered by the composite indexes in Meta
         help_text="User who performed the action"
     )
     
     action = models.CharField(
         max_length=20,
         choices=ACTIONS,
-        db_index=True,
         help_text="Action performed"
     )
     
@@ -424,8 +556,9 @@ class GenerationAudit(SoftDeleteMixin, models.Model):
     )
     
     details = models.JSONField(
-        default=dict,
+        null=True,
         blank=True,
+        default=None,
         help_text="Additional details about the action"
     )
     
@@ -433,6 +566,7 @@ class GenerationAudit(SoftDeleteMixin, models.Model):
         ordering = ['-timestamp']
         indexes = [
             models.Index(fields=['generation', '-timestamp']),
+            models.Index(fields=['session_id', '-timestamp']),
             models.Index(fields=['user', '-timestamp']),
             models.Index(fields=['action', '-timestamp']),
         ]
@@ -440,7 +574,44 @@ class GenerationAudit(SoftDeleteMixin, models.Model):
         verbose_name_plural = "Generation Audits"
     
     def __str__(self):
-        return f"{self.generation.session_id} - {self.action} - {self.timestamp.strftime('%Y-%m-%d %H:%M')}"
+        session = self.session_id.hex if self.session_id else '-'
+        return f"{session} - {self.action} - {self.timestamp:%Y-%m-%d %H:%M}"
+    
+    def save(self, *args, **kwargs):
+        """Copy the generation's session ID onto the audit row on first save."""
+        if not self.session_id and self.generation_id:
+            self.session_id = self.generation.session_id
+        super().save(*args, **kwargs)
+    
+    # Per-thread buffer of audit rows waiting to be written
+    _pending = threading.local()
+    
+    @classmethod
+    def queue(cls, **kwargs):
+        """
+        Buffer an audit entry to be written by the next flush().
+        
+        Inside a request, GenerationAuditMiddleware flushes once the response is
+        ready, so all entries for the request go out as a single INSERT. Code
+        running outside a request (e.g. Celery tasks) must call flush() itself.
+        """
+        entry = cls(**kwargs)
+        if not entry.session_id and entry.generation_id:
+            entry.session_id = entry.generation.session_id
+        if not hasattr(cls._pending, 'entries'):
+            cls._pending.entries = []
+        cls._pending.entries.append(entry)
+        return entry
+    
+    @classmethod
+    def flush(cls):
+        """Write all buffered audit entries with one bulk INSERT."""
+        entries = getattr(cls._pending, 'entries', None)
+        if not entries:
+            return 0
+        cls._pending.entries = []
+        cls.objects.bulk_create(entries, batch_size=500)
+        return len(entries)
 
 
 class FeatureUsage(models.Model):
@@ -453,18 +624,18 @@ class FeatureUsage(models.Model):
         null=True,
         blank=True,
         related_name='feature_usage',
+        db_index=False,  # covered by the composite indexes in Meta
         help_text="User using the feature"
     )
     
     feature = models.CharField(
         max_length=50,
-        db_index=True,
         help_text="Feature name (e.g., 'crop', 'batch_upload', 'export_pdf')"
     )
     
+    # Range scans use a BRIN index on PostgreSQL (migration 0018)
     timestamp = models.DateTimeField(
         auto_now_add=True,
-        db_index=True,
         help_text="When the feature was used"
     )
     
@@ -476,8 +647,9 @@ class FeatureUsage(models.Model):
     )
     
     metadata = models.JSONField(
-        default=dict,
+        null=True,
         blank=True,
+        default=None,
         help_text="Additional feature-specific data"
     )
     
@@ -492,7 +664,7 @@ class FeatureUsage(models.Model):
     
     def __str__(self):
         user_str = self.user.username if self.user else "Anonymous"
-        return f"{user_str} - {self.feature} - {self.timestamp.strftime('%Y-%m-%d %H:%M')}"
+        return f"{user_str} - {self.feature} - {self.timestamp:%Y-%m-%d %H:%M}"
 
 
 class PhotoConfiguration(models.Model):
@@ -500,24 +672,11 @@ class PhotoConfiguration(models.Model):
     Per-photo configuration for size and copies.
     Allows each photo in a batch to have different dimensions and copy counts.
     """
-    PHOTO_SIZE_CHOICES = [
-        ("passport_35x45", "Passport (3.5×4.5 cm)"),
-        ("passport_small", "Small Passport (2.5×3.5 cm)"),
-        ("id_card", "ID Card (3.0×4.0 cm)"),
-        ("visa_3x4", "Visa (3.0×4.0 cm)"),
-        ("visa_4x6", "Visa Large (4.0×6.0 cm)"),
-        ("uk_visa", "UK Visa (4.45×5.59 cm)"),
-        ("us_visa", "US Passport (5.0×5.0 cm)"),
-        ("schengen", "Schengen (3.5×4.5 cm)"),
-        ("australia", "Australia (4.5×5.5 cm)"),
-        ("canada", "Canada (3.5×4.5 cm)"),
-        ("custom", "Custom Size"),
-    ]
-    
     generation = models.ForeignKey(
         PhotoGeneration,
         on_delete=models.CASCADE,
         related_name='photo_configs',
+        db_index=False,  # covered by the (generation, photo_index) unique constraint
         help_text="Generation this photo belongs to"
     )
     
@@ -527,8 +686,8 @@ class PhotoConfiguration(models.Model):
     
     photo_size = models.CharField(
         max_length=30,
-        choices=PHOTO_SIZE_CHOICES,
-        default="passport_35x45",
+        choices=PhotoSize.choices,
+        default=PhotoSize.PASSPORT_35X45,
         help_text="Selected photo size preset"
     )
     
@@ -554,43 +713,33 @@ class PhotoConfiguration(models.Model):
     
     class Meta:
         ordering = ['generation', 'photo_index']
-        indexes = [
-            models.Index(fields=['generation', 'photo_index']),
-        ]
         unique_together = [['generation', 'photo_index']]
     
     def __str__(self):
-        return f"{self.generation.session_id} - Photo {self.photo_index} ({self.photo_size}, {self.copies} copies)"
+        return f"{self.generation.session_id.hex} - Photo {self.photo_index} ({self.photo_size}, {self.copies} copies)"
     
     def get_actual_dimensions(self):
         """Get the actual width and height in cm."""
-        if self.photo_size == "custom":
+        if self.photo_size == PhotoSize.CUSTOM:
             return (self.custom_width_cm, self.custom_height_cm)
-        
-        from generator.config import PHOTO_SIZES
-        if self.photo_size in PHOTO_SIZES:
-            size_info = PHOTO_SIZES[self.photo_size]
-            return (size_info["width"], size_info["height"])
-        
-        return None
+        return _SIZE_MAP.get(self.photo_size)
 
 
-@receiver(post_save, sender=User)
-def create_user_profile(sender, instance, created, **kwargs):
+@receiver(post_save, sender=User, dispatch_uid='generator.create_related_on_user_create')
+def create_related_on_user_create(sender, instance, created, **kwargs):
     """
-    Signal handler: Create empty profile when user is created.
+    Signal handler: Create empty profile and rate limit when user is created.
+    Uses conflict-ignoring inserts instead of get_or_create to skip the SELECT probes.
+    Rows are built from user_id so the unsaved instances aren't cached on user.profile.
     """
     if created:
-        UserProfile.objects.get_or_create(user=instance)
+        with transaction.atomic():
+            UserProfile.objects.bulk_create([UserProfile(user_id=instance.pk)], ignore_conflicts=True)
+            UserRateLimit.objects.bulk_create([UserRateLimit(user_id=instance.pk)], ignore_conflicts=True)
 
 
-@receiver(post_save, sender=User)
-def create_rate_limit(sender, instance, created, **kwargs):
-    """
-    Signal handler: Create rate limit when user is created.
-    """
-    if created:
-        UserRateLimit.objects.get_or_create(user=instance)
+# Model classes resolved from DeletionHistory.model_name
+_TRACKED_MODELS = {}
 
 
 class DeletionHistory(models.Model):
@@ -598,15 +747,25 @@ class DeletionHistory(models.Model):
     Track all soft delete and restoration operations.
     Provides audit trail for data lifecycle management.
     """
+    SUMMARY_CACHE_VERSION_KEY = 'delhist:ver'
+    
     ACTIONS = [
         ('deleted', 'Soft Deleted'),
         ('restored', 'Restored'),
         ('hard_deleted', 'Permanently Deleted'),
     ]
     
+    content_type = models.ForeignKey(
+        ContentType,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        db_index=False,  # covered by the (content_type, object_id, -performed_at) index
+        help_text="Content type of the model that was deleted/restored"
+    )
+    
     model_name = models.CharField(
         max_length=100,
-        db_index=True,
         help_text="Name of the model that was deleted/restored"
     )
     
@@ -618,7 +777,6 @@ class DeletionHistory(models.Model):
     action = models.CharField(
         max_length=20,
         choices=ACTIONS,
-        db_index=True,
         help_text="Action performed (deleted/restored/hard_deleted)"
     )
     
@@ -628,12 +786,13 @@ class DeletionHistory(models.Model):
         null=True,
         blank=True,
         related_name='deletion_actions',
+        db_index=False,  # covered by the composite indexes in Meta
         help_text="User who performed the action"
     )
     
+    # Range scans use a BRIN index on PostgreSQL (migration 0018)
     performed_at = models.DateTimeField(
         auto_now_add=True,
-        db_index=True,
         help_text="When the action was performed"
     )
     
@@ -643,14 +802,16 @@ class DeletionHistory(models.Model):
     )
     
     metadata = models.JSONField(
-        default=dict,
+        null=True,
         blank=True,
+        default=None,
         help_text="Additional metadata about the action"
     )
     
     class Meta:
         ordering = ['-performed_at']
         indexes = [
+            models.Index(fields=['content_type', 'object_id', '-performed_at']),
             models.Index(fields=['model_name', 'object_id', '-performed_at']),
             models.Index(fields=['performed_by', '-performed_at']),
             models.Index(fields=['action', '-performed_at']),
@@ -662,14 +823,78 @@ class DeletionHistory(models.Model):
         user_str = self.performed_by.username if self.performed_by else "System"
         return f"{self.model_name}#{self.object_id} - {self.action} by {user_str}"
     
-    def get_object(self):
-        """Try to retrieve the related object."""
+    @staticmethod
+    def get_summary_cache_version():
+        """Get the current version used to namespace cached history summaries."""
+        return cache.get_or_set(DeletionHistory.SUMMARY_CACHE_VERSION_KEY, 1, None)
+    
+    @staticmethod
+    def bump_summary_cache_version():
+        """Invalidate all cached history summaries by moving to a new version."""
         try:
+            cache.incr(DeletionHistory.SUMMARY_CACHE_VERSION_KEY)
+        except ValueError:
+            # Version key not set yet (or evicted) - nothing cached under it
+            cache.add(DeletionHistory.SUMMARY_CACHE_VERSION_KEY, 1, None)
+    
+    @staticmethod
+    def _get_tracked_model(model_name):
+        """Look up a generator model by name, memoized to skip the app registry."""
+        if model_name not in _TRACKED_MODELS:
             from django.apps import apps
-            model = apps.get_model('generator', self.model_name)
+            _TRACKED_MODELS[model_name] = apps.get_model('generator', model_name)
+        return _TRACKED_MODELS[model_name]
+    
+    def get_object(self):
+        """Try to retrieve the related object (reuses the one set by resolve_objects)."""
+        if hasattr(self, '_cached_object'):
+            return self._cached_object
+        try:
+            model = self._get_tracked_model(self.model_name)
             return model.all_objects.get(pk=self.object_id)
         except Exception:
             return None
+    
+    @classmethod
+    def resolve_objects(cls, rows):
+        """
+        Retrieve the related objects for many history rows at once.
+        
+        Runs one query per distinct model instead of one per row, and caches
+        each row's object so later get_object() calls skip the database.
+        
+        Args:
+            rows: Iterable of DeletionHistory records
+        
+        Returns:
+            Dictionary mapping model name to {object_id: object}
+        """
+        rows = list(rows)
+        groups = {}
+        for row in rows:
+            groups.setdefault(row.model_name, set()).add(row.object_id)
+        
+        resolved = {}
+        for model_name, ids in groups.items():
+            try:
+                model = cls._get_tracked_model(model_name)
+            except LookupError:
+                resolved[model_name] = {}
+                continue
+            resolved[model_name] = model.all_objects.in_bulk(ids)
+        
+        for row in rows:
+            row._cached_object = resolved[row.model_name].get(row.object_id)
+        return resolved
+
+
+@receiver(post_save, sender=DeletionHistory, dispatch_uid='generator.invalidate_deletion_history_summary')
+def invalidate_deletion_history_summary(sender, instance, created, **kwargs):
+    """
+    Signal handler: Invalidate cached history summaries when history is recorded.
+    """
+    if created:
+        DeletionHistory.bump_summary_cache_version()
 
 
 class AdminActivity(models.Model):
@@ -686,10 +911,15 @@ class AdminActivity(models.Model):
     ]
     
     action_type = models.CharField(max_length=20, choices=ACTION_CHOICES)
-    user = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='activities')
+    user = models.ForeignKey(
+        User, on_delete=models.SET_NULL, null=True, blank=True, related_name='activities',
+        db_index=False,  # covered by the (user, -timestamp) index
+    )
     ip_address = models.GenericIPAddressField(null=True, blank=True)
-    details = models.JSONField(default=dict, blank=True)
-    timestamp = models.DateTimeField(auto_now_add=True, db_index=True)
+    details = models.JSONField(null=True, blank=True, default=None)
+    # Recent-activity listings use the -timestamp btree below; range scans use
+    # a BRIN index on PostgreSQL (migration 0018)
+    timestamp = models.DateTimeField(auto_now_add=True)
     
     class Meta:
         verbose_name = "Admin Activity"
@@ -710,6 +940,9 @@ class SystemMaintenance(models.Model):
     """
     Store system maintenance schedules and settings
     """
+    SETTINGS_CACHE_KEY = 'sysmaint:1'
+    SETTINGS_CACHE_TIMEOUT = 300
+    
     auto_delete_days = models.IntegerField(
         default=30, 
         help_text="Delete soft-deleted records older than N days"
@@ -726,8 +959,20 @@ class SystemMaintenance(models.Model):
     def __str__(self):
         return f"Maintenance Settings (Auto-delete: {self.auto_delete_days} days)"
     
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        cache.delete(self.SETTINGS_CACHE_KEY)
+    
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        cache.delete(self.SETTINGS_CACHE_KEY)
+        return result
+    
     @staticmethod
     def get_settings():
-        """Get or create system maintenance settings"""
-        settings, created = SystemMaintenance.objects.get_or_create(pk=1)
+        """Get or create system maintenance settings (cached, invalidated on save)"""
+        settings = cache.get(SystemMaintenance.SETTINGS_CACHE_KEY)
+        if settings is None:
+            settings, created = SystemMaintenance.objects.get_or_create(pk=1)
+            cache.set(SystemMaintenance.SETTINGS_CACHE_KEY, settings, SystemMaintenance.SETTINGS_CACHE_TIMEOUT)
         return settings
@@ -0,0 +1,133 @@
+"""
+Redis-backed sliding-window generation counters.
+
+Live counters are kept in a Redis sorted set per user (one member per
+generation, scored by timestamp in ms) so recording a generation is a single
+EVALSHA instead of a SQL UPDATE. UserRateLimit remains the persistent/audit copy
+and is refreshed periodically by flush_rate_limits_task.
+
+The hourly limit is only enforced when settings.RATE_LIMIT_ENFORCED is on.
+Without Redis nothing is counted and no limit applies.
+"""
+import time
+import uuid
+import logging
+from typing import Dict, Optional
+
+from django.conf import settings
+
+logger = logging.getLogger('generator')
+
+try:
+    from django_redis import get_redis_connection
+except ImportError:
+    get_redis_connection = None
+
+KEY_PREFIX = 'rl:'
+
+# Members are retained for a day so the flush can report generations_today,
+# while the limit itself is checked over the last hour.
+RETENTION_MS = 24 * 60 * 60 * 1000
+WINDOW_MS = 60 * 60 * 1000
+
+# KEYS[1] = counter key
+# ARGV = now_ms, retention_ms, member
+RECORD_SCRIPT = """
+local key = KEYS[1]
+local now = tonumber(ARGV[1])
+local retention = tonumber(ARGV[2])
+
+redis.call('ZREMRANGEBYSCORE', key, '-inf', now - retention)
+redis.call('ZADD', key, now, ARGV[3])
+redis.call('PEXPIRE', key, retention)
+return redis.call('ZCARD', key)
+"""
+
+_script = None
+
+
+def _get_client():
+    """Return the shared Redis client, or None if Redis is not the cache backend."""
+    if get_redis_connection is None:
+        return None
+    try:
+        return get_redis_connection('default')
+    except NotImplementedError:
+        return None
+
+
+def _get_script(client):
+    """Register the record script once so calls go through EVALSHA."""
+    global _script
+    if _script is None:
+        _script = client.register_script(RECORD_SCRIPT)
+    return _script
+
+
+def record(user_id: int) -> None:
+    """
+    Count a successfully created generation for a user.
+
+    Args:
+        user_id: ID of the user who generated photos
+    """
+    client = _get_client()
+    if client is None:
+        return
+
+    try:
+        now_ms = int(time.time() * 1000)
+        _get_script(client)(
+            keys=[f'{KEY_PREFIX}{user_id}'],
+            args=[now_ms, RETENTION_MS, f'{now_ms}-{uuid.uuid4().hex[:8]}'],
+        )
+    except Exception as e:
+        logger.warning(f"Failed to record generation for user {user_id}: {e}")
+
+
+def is_over_limit(user_id: int, limit: Optional[int] = None) -> bool:
+    """
+    Check whether a user has reached their hourly generation limit.
+
+    Args:
+        user_id: ID of the user generating photos
+        limit: Maximum generations per hour (default: settings.RATE_LIMIT_PER_HOUR)
+
+    Returns:
+        True if the limit is enforced and reached, False otherwise
+    """
+    if not settings.RATE_LIMIT_ENFORCED:
+        return False
+    client = _get_client()
+    if client is None:
+        return False
+    if limit is None:
+        limit = settings.RATE_LIMIT_PER_HOUR
+
+    try:
+        now_ms = int(time.time() * 1000)
+        return client.zcount(f'{KEY_PREFIX}{user_id}', now_ms - WINDOW_MS, '+inf') >= limit
+    except Exception as e:
+        logger.warning(f"Rate limit check failed for user {user_id}: {e}")
+        return False
+
+
+def get_daily_counts() -> Dict[int, int]:
+    """
+    Read the number of generations in the last 24 hours for every tracked user.
+
+    Returns:
+        Dictionary mapping user ID to generation count
+    """
+    client = _get_client()
+    if client is None:
+        return {}
+
+    cutoff = int(time.time() * 1000) - RETENTION_MS
+    user_ids = []
+    pipe = client.pipeline(transaction=False)
+    for key in client.scan_iter(match=f'{KEY_PREFIX}*', count=1000):
+        key = key.decode() if isinstance(key, bytes) else key
+        user_ids.append(int(key[len(KEY_PREFIX):]))
+        pipe.zcount(key, cutoff, '+inf')
+    return dict(zip(user_ids, pipe.execute()))
@@ -1,32 +1,105 @@
 import os
 import io
 import base64
+import binascii
 import logging
+import math
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
 
 try:
     from celery import shared_task
+    from celery.signals import worker_process_init
 except Exception:
+    worker_process_init = None
+
     def shared_task(*args, **kwargs):
         def decorator(func):
             return func
         return decorator
+try:
+    from turbojpeg import TurboJPEG, TJPF_RGB, TJSAMP_444
+    _turbojpeg = TurboJPEG()
+except Exception:
+    # Missing package or libturbojpeg shared library; Pillow encodes instead
+    _turbojpeg = None
 from django.conf import settings
 from django.utils import timezone
-from PIL import Image
+from PIL import Image, ImageOps
 
-from .models import PhotoGeneration
+from .models import PhotoGeneration, UserRateLimit
+from .ratelimit import get_daily_counts
 from .utils import (
     generate_pdf,
     generate_jpeg,
     zip_files,
-    crop_to_passport_aspect_ratio,
-    remove_background,
+    open_photo,
+    crop_image_to_aspect_ratio,
+    remove_background_image,
+    get_rembg_session,
+    parse_hex_color,
+    rembg_remove,
 )
 
 logger = logging.getLogger('generator')
 
+_jpeg_buffers = threading.local()
 
-@shared_task(bind=True)
+
+def _encode_jpeg(pixels):
+    """Encode an RGB uint8 array as a quality-95, 4:4:4 JPEG and return a view of the bytes.
+
+    Uses libjpeg-turbo into a per-thread reusable buffer when available, so the
+    returned view is only valid until the next call on the same thread.
+    """
+    if _turbojpeg is not None:
+        size = _turbojpeg.buffer_size(pixels, TJSAMP_444)
+        buf = getattr(_jpeg_buffers, 'buf', None)
+        if buf is None or len(buf) < size:
+            buf = _jpeg_buffers.buf = bytearray(size)
+        _, length = _turbojpeg.encode(
+            pixels, quality=95, pixel_format=TJPF_RGB, jpeg_subsample=TJSAMP_444, dst=buf
+        )
+        return memoryview(buf)[:length]
+
+    output_buffer = io.BytesIO()
+    Image.fromarray(pixels).save(output_buffer, format='JPEG', quality=95, subsampling=0)
+    return output_buffer.getbuffer()
+
+
+def prewarm_rembg_session(**kwargs):
+    """Load the rembg model in each worker process before it accepts tasks."""
+    try:
+        get_rembg_session()
+        logger.info("rembg session loaded in worker process")
+    except Exception as e:
+        logger.warning(f"Could not pre-load rembg session: {e}")
+
+
+if worker_process_init is not None:
+    worker_process_init.connect(prewarm_rembg_session, dispatch_uid='generator.prewarm_rembg_session')
+
+
+def _prepare_photo(photo_path, photo_width_cm, photo_height_cm, remove_bg, bg_color):
+    """Load one photo, crop it to the target aspect ratio and optionally replace its background."""
+    try:
+        img = open_photo(photo_path, photo_width_cm, photo_height_cm)
+        img = crop_image_to_aspect_ratio(img, photo_width_cm, photo_height_cm)
+    except Exception as e:
+        logger.warning(f"Failed to load {os.path.basename(photo_path)}: {e}")
+        return None
+
+    if remove_bg:
+        try:
+            img = remove_background_image(img, bg_color)
+        except Exception as e:
+            logger.warning(f"Failed to remove background from {os.path.basename(photo_path)}: {e}")
+    return img
+
+
+@shared_task(bind=True, acks_late=True)
 def generate_photosheet_task(
     self,
     session_id,
@@ -48,16 +121,16 @@ def generate_photosheet_task(
 ):
     """Generate photosheet asynchronously and update PhotoGeneration record."""
     try:
-        # Crop photos to target aspect ratio
-        for photo_path in saved_photos:
-            crop_to_passport_aspect_ratio(photo_path, photo_width_cm, photo_height_cm)
-
-        # Optional background removal
-        if remove_bg:
-            for photo_path in saved_photos:
-                success = remove_background(photo_path, bg_color)
-                if not success:
-                    logger.warning(f"Failed to remove background from {os.path.basename(photo_path)}")
+        # Crop (and optionally remove the background of) each photo in parallel;
+        # Pillow and onnxruntime release the GIL, and the rembg session is shared.
+        # Prepared images stay in memory and go straight to the layout step.
+        max_workers = max(1, min(len(saved_photos), os.cpu_count() or 4))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            prepared = executor.map(
+                lambda path: _prepare_photo(path, photo_width_cm, photo_height_cm, remove_bg, bg_color),
+                saved_photos,
+            )
+            images = {path: img for path, img in zip(saved_photos, prepared) if img is not None}
 
         # Generate output
         output_dir = os.path.join(settings.MEDIA_ROOT, "outputs", session_id)
@@ -76,6 +149,7 @@ def generate_photosheet_task(
                 photo_width_cm=photo_width_cm,
                 photo_height_cm=photo_height_cm,
                 cut_line_style=cut_line_style,
+                images=images,
             )
         else:
             jpeg_files = generate_jpeg(
@@ -91,21 +165,25 @@ def generate_photosheet_task(
                 photo_width_cm=photo_width_cm,
                 photo_height_cm=photo_height_cm,
                 cut_line_style=cut_line_style,
+                images=images,
             )
             output_path = jpeg_files[0] if len(jpeg_files) == 1 else zip_files(jpeg_files, output_dir)
 
-        output_url = settings.MEDIA_URL + f"outputs/{session_id}/" + os.path.basename(output_path)
-        file_size = os.path.getsize(output_path) if os.path.exists(output_path) else None
-        total_copies = sum(copies_map.values()) if copies_map else 0
+        output_url = f"{settings.MEDIA_URL}outputs/{session_id}/{os.path.basename(output_path)}"
+        try:
+            file_size = os.stat(output_path).st_size
+        except OSError:
+            file_size = None
 
-        PhotoGeneration.objects.filter(session_id=session_id).update(
-            output_path=output_path,
-            output_url=output_url,
-            file_size_bytes=file_size,
-            total_copies=total_copies,
-            status='completed',
-            error_message='',
-        )
+        updates = {
+            'output_path': output_path,
+            'output_url': output_url,
+            'file_size_bytes': file_size,
+            'total_copies': sum(copies_map.values()) if copies_map else 0,
+            'status': 'completed',
+            'error_message': '',
+        }
+        PhotoGeneration.objects.filter(session_id=session_id).update(**updates)
 
         logger.info(f"Generated output for session {session_id}")
         return {'success': True, 'output_url': output_url}
@@ -118,42 +196,71 @@ def generate_photosheet_task(
         return {'success': False, 'error': str(e)}
 
 
+@shared_task
+def flush_rate_limits_task():
+    """Persist live Redis rate-limit counters to UserRateLimit (run by Celery beat)."""
+    counts = get_daily_counts()
+    if not counts:
+        return 0
+
+    rate_limits = list(
+        UserRateLimit.objects.filter(user_id__in=counts.keys()).only('id', 'user_id', 'generations_today')
+    )
+    for rate_limit in rate_limits:
+        rate_limit.generations_today = counts[rate_limit.user_id]
+    UserRateLimit.objects.bulk_update(rate_limits, ['generations_today'], batch_size=500)
+    return len(rate_limits)
+
+
 @shared_task(bind=True)
 def remove_background_task(self, image_data, bg_color):
     """Remove background asynchronously and return base64 image data. Optimized for limited resources."""
     try:
-        if ',' in image_data:
-            image_data = image_data.split(',')[1]
+        comma = image_data.find(',')
+        if comma != -1:
+            image_data = image_data[comma + 1:]
+
+        bg_rgb = parse_hex_color(bg_color)
+        if bg_rgb is None:
+            return {'success': False, 'error': f'Invalid color format: {bg_color}. Expected #RRGGBB'}
 
         image_bytes = base64.b64decode(image_data)
         
+        # Decode once and hand rembg a pixel array instead of re-encoded PNG bytes;
+        # apply EXIF orientation here since arrays carry no metadata
+        with io.BytesIO(image_bytes) as image_buffer:
+            img_temp = Image.open(image_buffer)
+            
+            # Let libjpeg decode large JPEGs at a reduced scale whose long side still covers 2000px
+            if img_temp.format == 'JPEG' and max(img_temp.size) > 2000:
+                ratio = 2000 / max(img_temp.size)
+                img_temp.draft('RGB', (math.ceil(img_temp.size[0] * ratio), math.ceil(img_temp.size[1] * ratio)))
+            img_temp.load()
+        # The encoded upload is no longer needed during inference
+        del image_data, image_bytes
+        img_temp = ImageOps.exif_transpose(img_temp)
+        
         # Optimize: Resize large images
-        img_temp = Image.open(io.BytesIO(image_bytes))
         if max(img_temp.size) > 2000:
             ratio = 2000 / max(img_temp.size)
             new_size = (int(img_temp.size[0] * ratio), int(img_temp.size[1] * ratio))
-            img_temp = img_temp.resize(new_size, Image.LANCZOS)
-            buffer = io.BytesIO()
-            img_temp.save(buffer, format='PNG')
-            image_bytes = buffer.getvalue()
+            # Box-reduce by whole factors, then bilinear for the rest; LANCZOS is
+            # reserved for the final print-size resize
+            img_temp = img_temp.resize(new_size, Image.BILINEAR, reducing_gap=2.0)
         
-        from rembg import remove, new_session
-        # Use lighter u2net_human_seg model for passport photos
-        session = new_session('u2net_human_seg')
-        output_bytes = remove(image_bytes, session=session)
-        img = Image.open(io.BytesIO(output_bytes)).convert("RGBA")
-
-        hex_color = bg_color.lstrip('#').strip().upper()
-        if len(hex_color) != 6:
-            return {'success': False, 'error': f'Invalid color format: {bg_color}. Expected #RRGGBB'}
-        bg_rgb = tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
-
-        background = Image.new("RGB", img.size, bg_rgb)
-        background.paste(img, (0, 0), img)
+        output_arr = rembg_remove(np.asarray(img_temp.convert('RGB')), session=get_rembg_session())
+        del img_temp
 
-        output_buffer = io.BytesIO()
-        background.save(output_buffer, format='JPEG', quality=95, subsampling=0)
-        output_base64 = base64.b64encode(output_buffer.getvalue()).decode('utf-8')
+        # Flatten onto the background color in uint16 fixed point (rgb*a + bg*(255-a)) / 255
+        alpha = output_arr[..., 3:4].astype(np.uint16)
+        rgb = output_arr[..., :3].astype(np.uint16)
+        bg = np.array(bg_rgb, dtype=np.uint16)
+        blended = (rgb * alpha + bg * (255 - alpha) + 127) // 255
+        del output_arr, alpha, rgb
+        jpeg_bytes = _encode_jpeg(blended.astype(np.uint8))
+        del blended
+        # Encode straight from the JPEG view, without an intermediate bytes copy
+        output_base64 = binascii.b2a_base64(jpeg_bytes, newline=False).decode('ascii')
 
         return {'success': True, 'image': f'data:image/jpeg;base64,{output_base64}'}
     except Exception as e:
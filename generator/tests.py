@@ -2,16 +2,26 @@
 Unit tests for passport photo generator.
 """
 import os
+import uuid
 import tempfile
+import zipfile
 from pathlib import Path
-from django.test import TestCase, Client
+from unittest import mock
+from django.test import TestCase, Client, override_settings
 from django.core.files.uploadedfile import SimpleUploadedFile
 from django.core.exceptions import ValidationError
 from django.contrib.auth.models import User
+from django.core.cache import cache
 from PIL import Image
 import io
+from datetime import date, timedelta
+from django.utils import timezone
 
-from generator.models import PhotoGeneration
+from generator import ratelimit
+from generator.models import (
+    GenerationAudit, PhotoConfiguration, PhotoGeneration, SystemMaintenance, UserProfile,
+    UserRateLimit,
+)
 from generator.validators import (
     validate_image_file,
     validate_numeric_field,
@@ -21,7 +31,11 @@ from generator.utils import (
     calculate_grid,
     crop_to_passport_aspect_ratio,
     cm_to_px,
+    generate_jpeg,
+    open_photo,
+    parse_hex_color,
     resolve_paper_size,
+    zip_files,
     PAPER_SIZES,
 )
 from generator.config import PASSPORT_CONFIG
@@ -198,8 +212,61 @@ class UtilsTests(TestCase):
             # Cleanup
             if os.path.exists(tmp_path):
                 os.unlink(tmp_path)
+    
+    def test_zip_files_stores_jpegs(self):
+        """Test that JPEGs are added to the archive without recompression."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            photo_path = os.path.join(tmp_dir, 'page_1.jpg')
+            Image.new('RGB', (100, 100), color='blue').save(photo_path, 'JPEG')
+            
+            zip_path = zip_files([photo_path], os.path.join(tmp_dir, 'out'))
+            
+            with zipfile.ZipFile(zip_path) as zf:
+                info = zf.getinfo('page_1.jpg')
+                self.assertEqual(info.compress_type, zipfile.ZIP_STORED)
+    
+    def test_open_photo_drafts_large_jpeg(self):
+        """Test that large JPEGs are decoded at a reduced scale that still covers 2x print size."""
+        with tempfile.NamedTemporaryFile(suffix='.jpg', delete=False) as tmp:
+            Image.new('RGB', (2400, 3600), color='green').save(tmp, 'JPEG')
+            tmp_path = tmp.name
+        
+        try:
+            img = open_photo(tmp_path, 3.5, 4.5)
+            self.assertLess(img.width, 2400)
+            self.assertGreaterEqual(img.width, cm_to_px(3.5) * 2)
+            self.assertGreaterEqual(img.height, cm_to_px(4.5) * 2)
+            img.close()
+        finally:
+            os.unlink(tmp_path)
+    
+    def test_generate_jpeg_decodes_each_photo_once(self):
+        """Test that every copy of a photo is pasted from one decoded, resized image."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            photo_path = os.path.join(tmp_dir, 'photo.jpg')
+            Image.new('RGB', (700, 900), color='red').save(photo_path, 'JPEG')
+            
+            with mock.patch('generator.utils.pyvips', None), \
+                    mock.patch('generator.utils.open_photo', wraps=open_photo) as opened:
+                pages = generate_jpeg(
+                    [photo_path], {photo_path: 40}, 'A4', 'portrait', 0.5, 0.3, 0.3, True,
+                    os.path.join(tmp_dir, 'out'),
+                )
+            
+            self.assertEqual(opened.call_count, 1)
+            self.assertEqual(len(pages), 2)
+            for page in pages:
+                self.assertTrue(os.path.exists(page))
+    
+    def test_parse_hex_color(self):
+        """Test hex color parsing accepts #RRGGBB in any case and rejects bad input."""
+        self.assertEqual(parse_hex_color('#FF8000'), (255, 128, 0))
+        self.assertEqual(parse_hex_color('00ff7f'), (0, 255, 127))
+        self.assertIsNone(parse_hex_color('#FFF'))
+        self.assertIsNone(parse_hex_color('#GG0000'))
 
 
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp())
 class ViewTests(TestCase):
     """Tests for views."""
     
@@ -384,7 +451,7 @@ class PhotoGenerationModelTests(TestCase):
         """Test creating a generation record for authenticated user."""
         gen = PhotoGeneration.objects.create(
             user=self.user,
-            session_id='test123',
+            session_id=uuid.uuid4().hex,
             num_photos=3,
             paper_size='A4',
             orientation='portrait',
@@ -401,9 +468,10 @@ class PhotoGenerationModelTests(TestCase):
     
     def test_create_generation_anonymous(self):
         """Test creating a generation record for anonymous user."""
+        session_id = uuid.uuid4()
         gen = PhotoGeneration.objects.create(
             user=None,
-            session_id='anon123',
+            session_id=session_id.hex,
             num_photos=1,
             paper_size='Letter',
             orientation='landscape',
@@ -413,12 +481,13 @@ class PhotoGenerationModelTests(TestCase):
         )
         
         self.assertIsNone(gen.user)
-        self.assertEqual(gen.session_id, 'anon123')
+        gen.refresh_from_db()
+        self.assertEqual(gen.session_id, session_id)
     
     def test_get_file_size_display(self):
         """Test file size display formatting."""
         gen = PhotoGeneration.objects.create(
-            session_id='size_test',
+            session_id=uuid.uuid4().hex,
             num_photos=1,
             output_path='/test/path',
             output_url='/test/url',
@@ -428,16 +497,30 @@ class PhotoGenerationModelTests(TestCase):
         size_display = gen.get_file_size_display()
         self.assertIn('KB', size_display)
     
+    def test_get_file_size_display_units(self):
+        """Test file size display picks the right unit at each boundary."""
+        cases = [
+            (None, 'Unknown'),
+            (1023, '1023.0 B'),
+            (1024, '1.0 KB'),
+            (5 * 1024 * 1024, '5.0 MB'),
+            (3 * 1024 ** 3, '3.0 GB'),
+            (2048 * 1024 ** 4, '2048.0 TB'),
+        ]
+        for size, expected in cases:
+            gen = PhotoGeneration(file_size_bytes=size)
+            self.assertEqual(gen.get_file_size_display(), expected)
+    
     def test_ordering(self):
         """Test that generations are ordered by creation date (newest first)."""
         gen1 = PhotoGeneration.objects.create(
-            session_id='first',
+            session_id=uuid.uuid4().hex,
             num_photos=1,
             output_path='/test/1',
             output_url='/test/1',
         )
         gen2 = PhotoGeneration.objects.create(
-            session_id='second',
+            session_id=uuid.uuid4().hex,
             num_photos=1,
             output_path='/test/2',
             output_url='/test/2',
@@ -446,6 +529,176 @@ class PhotoGenerationModelTests(TestCase):
         generations = list(PhotoGeneration.objects.all())
         self.assertEqual(generations[0], gen2)
         self.assertEqual(generations[1], gen1)
+    
+    def test_with_related_avoids_n_plus_one(self):
+        """Test with_related() loads users, configs and audits in fixed queries."""
+        for i in range(3):
+            gen = PhotoGeneration.objects.create(
+                user=self.user,
+                session_id=uuid.uuid4().hex,
+                output_path=f'/test/{i}',
+                output_url=f'/test/{i}',
+            )
+            PhotoConfiguration.objects.create(
+                generation=gen, photo_index=0, copies=2,
+                photo_size='custom', custom_width_cm=3.0, custom_height_cm=4.0,
+            )
+        
+        with self.assertNumQueries(3):
+            for gen in PhotoGeneration.objects.with_related():
+                gen.user.username
+                for config in gen.photo_configs.all():
+                    self.assertEqual(config.get_actual_dimensions(), (3.0, 4.0))
+                list(gen.audit_logs.all())
+    
+    def test_active_excludes_finished(self):
+        """Test active() returns only pending/processing generations, oldest first."""
+        statuses = ['completed', 'processing', 'failed', 'pending']
+        for status in statuses:
+            PhotoGeneration.objects.create(
+                user=self.user,
+                output_path='/media/test.pdf',
+                output_url='/media/test.pdf',
+                status=status,
+            )
+        
+        self.assertEqual(
+            list(PhotoGeneration.objects.active().values_list('status', flat=True)),
+            ['processing', 'pending'],
+        )
+
+
+class GenerationAuditModelTests(TestCase):
+    """Tests for GenerationAudit model."""
+    
+    def test_queue_and_flush(self):
+        """Test queued entries are written together on flush."""
+        generation = PhotoGeneration.objects.create(
+            output_path='/media/test.pdf',
+            output_url='/media/test.pdf',
+        )
+        for action in ('created', 'downloaded', 'downloaded'):
+            GenerationAudit.queue(generation=generation, action=action)
+        self.assertFalse(GenerationAudit.objects.exists())
+        
+        with self.assertNumQueries(1):
+            self.assertEqual(GenerationAudit.flush(), 3)
+        
+        self.assertEqual(
+            set(GenerationAudit.objects.values_list('session_id', flat=True)),
+            {generation.session_id},
+        )
+        self.assertEqual(GenerationAudit.flush(), 0)
+
+
+class UserRateLimitModelTests(TestCase):
+    """Tests for UserRateLimit model."""
+    
+    def setUp(self):
+        """Set up test user (rate limit is created by signal)."""
+        self.user = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpass123'
+        )
+        self.rate_limit = UserRateLimit.objects.get(user=self.user)
+    
+    def test_user_related_rows_are_saved(self):
+        """Test the signal-created profile and rate limit are persisted rows."""
+        self.assertIsNotNone(self.user.profile.pk)
+        self.assertEqual(self.user.rate_limit.pk, self.rate_limit.pk)
+    
+    def test_reset_if_needed_after_window(self):
+        """Test counters reset once the 24 hour window has passed."""
+        UserRateLimit.objects.filter(pk=self.rate_limit.pk).update(
+            generations_today=5,
+            total_size_today_mb=12.5,
+            last_reset=timezone.now() - timedelta(hours=25),
+        )
+        self.rate_limit.refresh_from_db()
+        
+        self.assertTrue(self.rate_limit.reset_if_needed())
+        self.assertEqual(self.rate_limit.generations_today, 0)
+        
+        self.rate_limit.refresh_from_db()
+        self.assertEqual(self.rate_limit.generations_today, 0)
+        self.assertEqual(self.rate_limit.total_size_today_mb, 0.0)
+    
+    def test_reset_if_needed_within_window(self):
+        """Test counters are kept inside the 24 hour window."""
+        UserRateLimit.objects.filter(pk=self.rate_limit.pk).update(generations_today=5)
+        self.rate_limit.refresh_from_db()
+        
+        self.assertFalse(self.rate_limit.reset_if_needed())
+        self.rate_limit.refresh_from_db()
+        self.assertEqual(self.rate_limit.generations_today, 5)
+
+
+class RateLimitTests(TestCase):
+    """Test generation rate limiting."""
+    
+    def setUp(self):
+        self.user = User.objects.create_user(username='limited', password='testpass123')
+    
+    def test_limit_not_enforced_by_default(self):
+        """Test that recorded generations never block users unless enforcement is enabled."""
+        for _ in range(3):
+            ratelimit.record(self.user.id)
+        self.assertFalse(ratelimit.is_over_limit(self.user.id, limit=1))
+    
+    @override_settings(RATE_LIMIT_ENFORCED=True)
+    def test_no_limit_without_redis(self):
+        """Test that the limit degrades to allowing generations when Redis is not available."""
+        ratelimit.record(self.user.id)
+        self.assertFalse(ratelimit.is_over_limit(self.user.id, limit=1))
+
+
+class UserProfileModelTests(TestCase):
+    """Tests for UserProfile model."""
+    
+    def test_profile_complete_computed_by_database(self):
+        """Test profile_complete follows the required fields."""
+        user = User.objects.create_user(username='testuser', password='testpass123')
+        self.assertFalse(UserProfile.objects.get(user=user).profile_complete)
+        
+        UserProfile.objects.filter(user=user).update(
+            date_of_birth=date(1990, 1, 1),
+            phone_number='+919876543210',
+            street_address='1 Main Road',
+            city='Delhi',
+            state='DL',
+            postal_code='110001',
+        )
+        self.assertTrue(UserProfile.objects.get(user=user).profile_complete)
+    
+    def test_filter_phone_ignores_formatting(self):
+        """Test phone lookups match regardless of separators."""
+        user = User.objects.create_user(username='testuser', password='testpass123')
+        UserProfile.objects.filter(user=user).update(phone_number='+91 98765-43210')
+        
+        self.assertEqual(UserProfile.objects.filter_phone('919876543210').get().user, user)
+        self.assertFalse(UserProfile.objects.filter_phone('98765').exists())
+
+
+class SystemMaintenanceModelTests(TestCase):
+    """Tests for SystemMaintenance model."""
+    
+    def setUp(self):
+        cache.delete(SystemMaintenance.SETTINGS_CACHE_KEY)
+    
+    def test_get_settings_cached(self):
+        """Test settings are served from the cache after the first lookup."""
+        SystemMaintenance.get_settings()
+        with self.assertNumQueries(0):
+            SystemMaintenance.get_settings()
+    
+    def test_save_invalidates_cached_settings(self):
+        """Test saving settings is visible to the next lookup."""
+        settings = SystemMaintenance.get_settings()
+        settings.auto_delete_days = 7
+        settings.save()
+        
+        self.assertEqual(SystemMaintenance.get_settings().auto_delete_days, 7)
 
 
 class HistoryViewTests(TestCase):
@@ -480,7 +733,7 @@ class HistoryViewTests(TestCase):
         # Create generation for user
         PhotoGeneration.objects.create(
             user=self.user,
-            session_id='test123',
+            session_id=uuid.uuid4().hex,
             num_photos=2,
             paper_size='A4',
             orientation='portrait',
@@ -500,7 +753,7 @@ class HistoryViewTests(TestCase):
         # Create multiple generations
         PhotoGeneration.objects.create(
             user=self.user,
-            session_id='test1',
+            session_id=uuid.uuid4().hex,
             num_photos=2,
             output_type='PDF',
             output_path='/test/1.pdf',
@@ -509,7 +762,7 @@ class HistoryViewTests(TestCase):
         )
         PhotoGeneration.objects.create(
             user=self.user,
-            session_id='test2',
+            session_id=uuid.uuid4().hex,
             num_photos=3,
             output_type='JPEG',
             output_path='/test/2.jpg',
@@ -2,6 +2,8 @@
 Test soft delete functionality.
 Run with: python manage.py test generator.tests_soft_delete
 """
+import uuid
+
 from django.test import TestCase
 from django.contrib.auth.models import User
 from django.utils import timezone
@@ -21,7 +23,7 @@ class SoftDeleteTestCase(TestCase):
         
         self.generation = PhotoGeneration.objects.create(
             user=self.user,
-            session_id='test_session_123',
+            session_id=uuid.uuid4().hex,
             num_photos=5,
             paper_size='A4',
             orientation='portrait',
@@ -103,10 +105,40 @@ class SoftDeleteTestCase(TestCase):
         
         history = DeletionHistory.objects.latest('performed_at')
         self.assertEqual(history.model_name, 'PhotoGeneration')
+        self.assertEqual(history.content_type.model_class(), PhotoGeneration)
         self.assertEqual(history.object_id, self.generation.pk)
         self.assertEqual(history.action, 'deleted')
         self.assertEqual(history.performed_by, self.user)
     
+    def test_bulk_soft_delete(self):
+        """Test bulk_soft_delete() marks rows deleted and records history for each."""
+        other = PhotoGeneration.objects.create(
+            user=self.user,
+            session_id=uuid.uuid4().hex,
+            output_path='/media/other.pdf',
+            output_url='/media/other.pdf',
+        )
+        
+        count = PhotoGeneration.objects.bulk_soft_delete(
+            PhotoGeneration.objects.filter(user=self.user),
+            deleted_by=self.user,
+            reason='Bulk test',
+        )
+        self.assertEqual(count, 2)
+        self.assertFalse(PhotoGeneration.objects.exists())
+        
+        history = DeletionHistory.objects.filter(action='deleted', reason='Bulk test')
+        self.assertEqual(
+            set(history.values_list('object_id', flat=True)),
+            {self.generation.pk, other.pk},
+        )
+        
+        # Already-deleted rows are skipped
+        self.assertEqual(
+            PhotoGeneration.objects.bulk_soft_delete(PhotoGeneration.all_objects.all()),
+            0,
+        )
+    
     def test_restoration_history_created(self):
         """Test that restoration history is created on restore."""
         # Soft delete first
@@ -128,7 +160,7 @@ class SoftDeleteTestCase(TestCase):
         # Create another generation (active)
         active_gen = PhotoGeneration.objects.create(
             user=self.user,
-            session_id='active_session',
+            session_id=uuid.uuid4().hex,
             num_photos=3,
             paper_size='A4',
             orientation='portrait',
@@ -186,7 +218,7 @@ class DeletionHistoryTestCase(TestCase):
         # Create and delete a generation
         generation = PhotoGeneration.objects.create(
             user=self.user,
-            session_id='test_session',
+            session_id=uuid.uuid4().hex,
             num_photos=1,
             paper_size='A4',
             orientation='portrait',
@@ -207,6 +239,35 @@ class DeletionHistoryTestCase(TestCase):
         self.assertEqual(obj.pk, generation.pk)
         self.assertIsInstance(obj, PhotoGeneration)
     
+    def test_resolve_objects(self):
+        """Test resolve_objects() fetches related objects in bulk."""
+        generations = [
+            PhotoGeneration.objects.create(
+                user=self.user,
+                session_id=uuid.uuid4().hex,
+                output_path='/media/test.pdf',
+                output_url='/media/test.pdf',
+            )
+            for i in range(3)
+        ]
+        for generation in generations:
+            generation.delete(deleted_by=self.user, reason='Test')
+        DeletionHistory.objects.create(model_name='PhotoGeneration', object_id=999999, action='deleted')
+        
+        rows = list(DeletionHistory.objects.all())
+        with self.assertNumQueries(1):
+            resolved = DeletionHistory.resolve_objects(rows)
+        
+        self.assertEqual(
+            set(resolved['PhotoGeneration']),
+            {generation.pk for generation in generations},
+        )
+        
+        # Resolved rows answer get_object() without further queries
+        with self.assertNumQueries(0):
+            objects = [row.get_object() for row in rows]
+        self.assertEqual(sum(obj is None for obj in objects), 1)
+    
     def test_string_representation(self):
         """Test __str__ method."""
         history = DeletionHistory.objects.create(
@@ -219,6 +280,18 @@ class DeletionHistoryTestCase(TestCase):
         
         expected = 'PhotoGeneration#123 - deleted by testuser'
         self.assertEqual(str(history), expected)
+    
+    def test_summary_cache_version_bumped_on_create(self):
+        """Test that recording history invalidates cached summaries."""
+        version = DeletionHistory.get_summary_cache_version()
+        
+        DeletionHistory.objects.create(
+            model_name='PhotoGeneration',
+            object_id=123,
+            action='deleted',
+        )
+        
+        self.assertNotEqual(DeletionHistory.get_summary_cache_version(), version)
 
 
 print('✅ Soft delete tests defined. Run with: python manage.py test generator.tests_soft_delete')
@@ -1,14 +1,12 @@
 """
 URL configuration for passport photo generator.
 """
-from django.urls import path
+from django.urls import include, path
 from .views import index
 from .auth_views import (
     user_login, user_logout, history, profile, edit_profile,
-    soft_delete_generation, admin_dashboard, generation_status,
-    create_user, manage_users
+    admin_dashboard, create_user, manage_users
 )
-from .api_views import remove_background_api, remove_background_status
 
 app_name = 'generator'
 
@@ -22,7 +20,6 @@ urlpatterns = [
     path("admin/dashboard/", admin_dashboard, name="admin_dashboard"),
     path("admin/users/", manage_users, name="manage_users"),
     path("admin/users/create/", create_user, name="create_user"),
-    path("api/remove-background/", remove_background_api, name="remove_background_api"),
-    path("api/remove-background/status/<str:task_id>/", remove_background_status, name="remove_background_status"),
-    path("api/generation-status/<str:session_id>/", generation_status, name="generation_status"),
-    path("api/delete/<int:generation_id>/", soft_delete_generation, name="soft_delete"),]
\ No newline at end of file
+    # API routes keep the generator: namespace (the include has no app_name)
+    path("api/", include("generator.api_urls")),
+]
@@ -1,31 +1,72 @@
 import os
-import io
+import itertools
 import logging
-from datetime import datetime
-from typing import List, Dict, Tuple, Optional
-from reportlab.pdfgen import canvas
-from reportlab.lib.units import cm
-from PIL import Image, ImageDraw
+import mmap
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import TYPE_CHECKING, List, Dict, Tuple, Optional
+from PIL import Image, ImageDraw, ImageOps, features
+from django.conf import settings
 import zipfile
 from .config import PASSPORT_CONFIG
 
+try:
+    from rembg import new_session, remove as rembg_remove
+except ImportError:
+    new_session = rembg_remove = None
+
+try:
+    import pyvips
+except Exception:
+    # Missing package or libvips shared library; Pillow decodes and resizes instead
+    pyvips = None
+
+if TYPE_CHECKING:
+    from reportlab.pdfgen import canvas
+
 logger = logging.getLogger('generator')
 
+# Decoding, resizing and encoding all run in Pillow's C code; the official wheels
+# bundle libjpeg-turbo, but source builds against plain libjpeg are much slower
+PIL_LIBJPEG_TURBO = bool(features.check_feature("libjpeg_turbo"))
+if not PIL_LIBJPEG_TURBO:
+    logger.warning("Pillow is not using libjpeg-turbo; JPEG decoding and encoding will be slower")
+
 # ==================================================
 # CONSTANTS
 # ==================================================
 PHOTO_W_CM = PASSPORT_CONFIG["photo_width_cm"]
 PHOTO_H_CM = PASSPORT_CONFIG["photo_height_cm"]
 DPI = 300
+# PDF points per cm (reportlab.lib.units.cm); reportlab itself is only imported by generate_pdf
+CM_TO_PT = 72 / 2.54
+PX_PER_CM = CM_TO_PT / 72 * DPI
 
 # Cut line settings
 CUT_LINE_WIDTH_PDF = 0.4
 CUT_LINE_SIZE_PDF = 5
-CUT_LINE_SIZE_IMG = 15
-CUT_LINE_WIDTH_IMG = 1
 
-# JPEG quality
-JPEG_QUALITY = 95
+# Large downscales first box-reduce to within this factor of the target, then
+# apply LANCZOS; at 3 the result is indistinguishable from a full LANCZOS pass
+LANCZOS_REDUCING_GAP = 3.0
+
+# Cropped/background-removed photos are working copies printed at a few cm,
+# so they use 4:2:0 chroma subsampling and a slightly lower quality
+PHOTO_JPEG_QUALITY = 90
+PHOTO_JPEG_SUBSAMPLING = 2
+
+# Formats stored as-is inside ZIP archives
+PRECOMPRESSED_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.webp', '.pdf', '.zip')
+ZIP_COPY_CHUNK_SIZE = 1024 * 1024
+ZIP_MMAP_THRESHOLD = 4 * 1024 * 1024
+
+# EXIF tag holding the camera orientation (ExifTags.Base.Orientation)
+EXIF_ORIENTATION = 0x0112
+
+_HEX_DIGITS = frozenset('0123456789ABCDEF')
 
 PAPER_SIZES = {
     "A4": {"width_cm": 21.0, "height_cm": 29.7},
@@ -37,11 +78,110 @@ PAPER_SIZES = {
 # ==================================================
 # HELPERS
 # ==================================================
+_rembg_session_lock = threading.Lock()
+_filename_counter = itertools.count()
+
+
+def _unique_ts() -> str:
+    """Timestamp for output filenames, with a per-process counter so concurrent outputs never collide."""
+    return f"{time.strftime('%Y%m%d_%H%M%S')}_{next(_filename_counter) % 10000:04d}"
+
+
+def _existing_paths(paths: List[str]) -> set:
+    """
+    Return the subset of paths that exist, listing each directory once.
+    
+    Photos of a generation share one upload directory, so a single scandir
+    replaces a stat call per photo.
+    """
+    names_by_dir = {}
+    found = set()
+    for path in paths:
+        directory, name = os.path.split(path)
+        if directory not in names_by_dir:
+            try:
+                with os.scandir(directory or ".") as entries:
+                    names_by_dir[directory] = {entry.name for entry in entries}
+            except OSError:
+                names_by_dir[directory] = set()
+        if name in names_by_dir[directory]:
+            found.add(path)
+    return found
+
+
+def get_rembg_session(model_name: str = None):
+    """
+    Return a rembg session for the model, loading it once per process.
+    
+    Loading the ONNX model is the dominant cost of background removal, so
+    long-lived workers keep the session in memory and reuse it (Celery
+    workers load it at process start). The lock keeps threads that ask
+    for a cold session at the same time from each loading their own copy.
+    
+    Raises:
+        ImportError: If rembg is not installed
+    """
+    with _rembg_session_lock:
+        return _load_rembg_session(model_name)
+
+
+@lru_cache(maxsize=2)
+def _load_rembg_session(model_name: str = None):
+    """
+    Build a rembg session; call get_rembg_session() for the shared one.
+    
+    Without an explicit model name, settings.REMBG_MODEL_PATH (a custom, typically
+    quantized, ONNX file) is used if set, otherwise settings.REMBG_MODEL.
+    The session runs on the first available of settings.REMBG_PROVIDERS, so
+    GPU hosts with onnxruntime-gpu use CUDA and everything else the CPU, with
+    settings.REMBG_THREADS CPU threads per inference (0 keeps ONNX Runtime's
+    one per physical core).
+    
+    Raises:
+        ImportError: If rembg is not installed
+    """
+    if new_session is None:
+        raise ImportError("rembg is not installed")
+    providers = settings.REMBG_PROVIDERS
+    if model_name is None and settings.REMBG_MODEL_PATH:
+        model_name, kwargs = 'u2net_custom', {'model_path': settings.REMBG_MODEL_PATH}
+    else:
+        model_name, kwargs = model_name or settings.REMBG_MODEL, {}
+    
+    if not settings.REMBG_THREADS:
+        return new_session(model_name, providers=providers, **kwargs)
+    
+    # new_session() only takes thread counts from OMP_NUM_THREADS, so build the
+    # session class it would pick with explicit SessionOptions instead
+    import onnxruntime as ort
+    from rembg.sessions import sessions_class
+    
+    sess_options = ort.SessionOptions()
+    sess_options.intra_op_num_threads = settings.REMBG_THREADS
+    session_class = next((sc for sc in sessions_class if sc.name() == model_name), None)
+    if session_class is None:
+        raise ValueError(f"No rembg session class for model {model_name}")
+    return session_class(model_name, sess_options, providers=providers, **kwargs)
+
+
+@lru_cache(maxsize=128)
+def parse_hex_color(value: str) -> Optional[Tuple[int, int, int]]:
+    """Parse a #RRGGBB color ('#' optional, any case) into an RGB tuple, or None if invalid."""
+    hex_color = value.lstrip('#').strip().upper()
+    if len(hex_color) != 6 or not _HEX_DIGITS.issuperset(hex_color):
+        return None
+    packed = int(hex_color, 16)
+    return (packed >> 16) & 0xFF, (packed >> 8) & 0xFF, packed & 0xFF
+
+
 def cm_to_px(value_cm: float, dpi: int = DPI) -> int:
     """Convert centimeters to pixels at given DPI."""
-    return int((value_cm * cm) / 72 * dpi)
+    px_per_cm = PX_PER_CM if dpi == DPI else CM_TO_PT / 72 * dpi
+    # The epsilon keeps exact inch multiples (e.g. Letter's 21.59 cm) from truncating one pixel short
+    return int(value_cm * px_per_cm + 1e-6)
 
 
+@lru_cache(maxsize=64)
 def resolve_paper_size(paper_size: str, orientation: str) -> Tuple[float, float, float, float]:
     """
     Resolve paper size and orientation to dimensions.
@@ -62,9 +202,10 @@ def resolve_paper_size(paper_size: str, orientation: str) -> Tuple[float, float,
     if orientation == "landscape":
         w_cm, h_cm = h_cm, w_cm
 
-    return w_cm * cm, h_cm * cm, w_cm, h_cm
+    return w_cm * CM_TO_PT, h_cm * CM_TO_PT, w_cm, h_cm
 
 
+@lru_cache(maxsize=256)
 def calculate_grid(paper_w_cm: float, paper_h_cm: float, margin: float, 
                    col_gap: float, row_gap: float, photo_w_cm: float = None, 
                    photo_h_cm: float = None) -> Tuple[int, int]:
@@ -96,33 +237,169 @@ def calculate_grid(paper_w_cm: float, paper_h_cm: float, margin: float,
     return max(cols, 1), max(rows, 1)
 
 
-def draw_cut_lines_pdf(c: canvas.Canvas, x: float, y: float, w: float, h: float, 
+def draw_cut_lines_pdf(c: "canvas.Canvas", x: float, y: float, w: float, h: float, 
                        size: float = CUT_LINE_SIZE_PDF) -> None:
     """Draw corner cut lines on PDF canvas."""
     c.setLineWidth(CUT_LINE_WIDTH_PDF)
+    segments = []
     for dx, dy in [(0, 0), (w, 0), (0, h), (w, h)]:
-        c.line(x + dx, y + dy, x + dx + (size if dx == 0 else -size), y + dy)
-        c.line(x + dx, y + dy, x + dx, y + dy + (size if dy == 0 else -size))
+        segments.append((x + dx, y + dy, x + dx + (size if dx == 0 else -size), y + dy))
+        segments.append((x + dx, y + dy, x + dx, y + dy + (size if dy == 0 else -size)))
+    # One path for all eight marks
+    c.lines(segments)
 
 
-def draw_cut_lines_img(draw: ImageDraw.Draw, x: int, y: int, w: int, h: int, 
-                       size: int = CUT_LINE_SIZE_IMG) -> None:
-    """Draw corner cut lines on PIL ImageDraw."""
-    draw.line((x, y, x + size, y), fill="black", width=CUT_LINE_WIDTH_IMG)
-    draw.line((x, y, x, y + size), fill="black", width=CUT_LINE_WIDTH_IMG)
-    draw.line((x + w, y, x + w - size, y), fill="black", width=CUT_LINE_WIDTH_IMG)
-    draw.line((x + w, y, x + w, y + size), fill="black", width=CUT_LINE_WIDTH_IMG)
-    draw.line((x, y + h, x + size, y + h), fill="black", width=CUT_LINE_WIDTH_IMG)
-    draw.line((x, y + h, x, y + h - size), fill="black", width=CUT_LINE_WIDTH_IMG)
-    draw.line((x + w, y + h, x + w - size, y + h), fill="black", width=CUT_LINE_WIDTH_IMG)
-    draw.line((x + w, y + h, x + w, y + h - size), fill="black", width=CUT_LINE_WIDTH_IMG)
+def open_photo(image_path: str, width_cm: float = None, height_cm: float = None) -> Image.Image:
+    """
+    Open and load a photo, letting libjpeg downscale JPEGs while decoding.
+    
+    JPEGs are decoded at the smallest 1/2, 1/4 or 1/8 scale that still covers
+    twice the printed size at DPI, which is far below a phone camera's resolution.
+    The image is returned upright, with any EXIF orientation already applied.
+    
+    Args:
+        image_path: Path to the image file
+        width_cm: Printed photo width in cm (default: 3.5 cm)
+        height_cm: Printed photo height in cm (default: 4.5 cm)
+    
+    Returns:
+        Loaded PIL image
+    """
+    if width_cm is None:
+        width_cm = PASSPORT_CONFIG["photo_width_cm"]
+    if height_cm is None:
+        height_cm = PASSPORT_CONFIG["photo_height_cm"]
+    img = Image.open(image_path)
+    if img.format == "JPEG":
+        img.draft("RGB", (cm_to_px(width_cm) * 2, cm_to_px(height_cm) * 2))
+    img.load()
+    
+    # Apply the EXIF orientation once, in place, so later steps see upright pixels;
+    # the original value is kept in info so callers know the pixels changed
+    orientation = img.getexif().get(EXIF_ORIENTATION, 1)
+    if orientation != 1:
+        ImageOps.exif_transpose(img, in_place=True)
+        img.info["orientation"] = orientation
+    return img
 
 
-def crop_to_passport_aspect_ratio(image_path: str, width_cm: float = None, height_cm: float = None) -> bool:
+def _vips_tile(image_path: str, width_px: int, height_px: int) -> Image.Image:
     """
-    Crop an image to match photo aspect ratio.
+    Decode and resize a photo to exactly width_px x height_px with libvips.
+    
+    libvips shrinks on load and streams the rest of the resize in small tiles, so
+    a full-resolution source is never held in memory. EXIF orientation is applied
+    and alpha is dropped, as open_photo() followed by convert("RGB") would do.
+    
+    Args:
+        image_path: Path to the image file
+        width_px: Target width in pixels
+        height_px: Target height in pixels
+    
+    Returns:
+        RGB PIL image of the requested size
+    """
+    tile = pyvips.Image.thumbnail(image_path, width_px, height=height_px, size="force")
+    if tile.interpretation != "srgb":
+        tile = tile.colourspace("srgb")
+    if tile.bands > 3:
+        tile = tile.extract_band(0, n=3)
+    if tile.format != "uchar":
+        tile = tile.cast("uchar")
+    return Image.frombytes("RGB", (tile.width, tile.height), tile.write_to_memory())
+
+
+def _aspect_crop_box(size: Tuple[int, int], width_cm: float, height_cm: float) -> Tuple[int, int, int, int]:
+    """
+    Return the centered (left, top, right, bottom) box with the photo aspect ratio.
+    
+    The box covers the whole image when its aspect ratio already matches.
+    """
+    original_width, original_height = size
+    target_aspect = width_cm / height_cm
+    current_aspect = original_width / original_height
+    
+    # If aspect ratios match (within small tolerance), no cropping needed
+    if abs(current_aspect - target_aspect) < 0.001:
+        return (0, 0, original_width, original_height)
+    
+    # Calculate crop dimensions
+    if current_aspect > target_aspect:
+        # Image is wider than target - crop width
+        new_width = int(original_height * target_aspect)
+        left = (original_width - new_width) // 2
+        return (left, 0, left + new_width, original_height)
+    else:
+        # Image is taller than target - crop height
+        new_height = int(original_width / target_aspect)
+        top = (original_height - new_height) // 2
+        return (0, top, original_width, top + new_height)
+
+
+def crop_image_to_aspect_ratio(img: Image.Image, width_cm: float = None, height_cm: float = None) -> Image.Image:
+    """
+    Crop an in-memory image to match photo aspect ratio.
     Uses centered cropping to preserve the center of the image.
     
+    Args:
+        img: PIL image to crop
+        width_cm: Target width in cm (default: 3.5 cm)
+        height_cm: Target height in cm (default: 4.5 cm)
+    
+    Returns:
+        RGB image with the target aspect ratio (the input itself if no change was needed)
+    """
+    if width_cm is None:
+        width_cm = PASSPORT_CONFIG["photo_width_cm"]
+    if height_cm is None:
+        height_cm = PASSPORT_CONFIG["photo_height_cm"]
+    
+    # Convert to RGB if necessary (handles RGBA, P, etc.)
+    if img.mode != "RGB":
+        img = img.convert("RGB")
+    
+    box = _aspect_crop_box(img.size, width_cm, height_cm)
+    if box == (0, 0) + img.size:
+        return img
+    
+    # Perform centered crop
+    return img.crop(box)
+
+
+def save_photo(img: Image.Image, image_path: str) -> None:
+    """Save an RGB photo back to its path, choosing the format from the file extension."""
+    ext = os.path.splitext(image_path)[1].lower()
+    if ext == '.png':
+        img.save(image_path, "PNG")
+    else:
+        # JPEG for .jpg/.jpeg and as the default
+        img.save(image_path, "JPEG", quality=PHOTO_JPEG_QUALITY, subsampling=PHOTO_JPEG_SUBSAMPLING)
+
+
+def dashed_line_mask(span: int, dash_length: int, gap_length: int, vertical: bool = False) -> Image.Image:
+    """
+    Build a 1px-wide "L" mask of a dashed line covering offsets 0..span.
+    
+    Dashes cover dash_length + 1 pixels and start every dash_length + gap_length
+    pixels, the same pixels as drawing each dash with ImageDraw.line.
+    """
+    period = dash_length + gap_length
+    unit = b"\xff" * (dash_length + 1) + b"\x00" * (gap_length - 1)
+    coverage = bytearray((unit * (span // period + 1))[:span + 1])
+    if span % period == 0:
+        # A dash would start exactly at the end of the line, which is never drawn
+        coverage[span] = 0
+    size = (1, span + 1) if vertical else (span + 1, 1)
+    return Image.frombytes("L", size, bytes(coverage))
+
+
+def crop_to_passport_aspect_ratio(image_path: str, width_cm: float = None, height_cm: float = None) -> bool:
+    """
+    Crop an image file in place to match photo aspect ratio.
+    
+    Larger photos are also scaled down to their printed size at DPI, so the
+    PDF/JPEG generators can place them without resampling.
+    
     Args:
         image_path: Path to the image file to crop
         width_cm: Target width in cm (default: 3.5 cm)
@@ -135,57 +412,39 @@ def crop_to_passport_aspect_ratio(image_path: str, width_cm: float = None, heigh
         width_cm = PASSPORT_CONFIG["photo_width_cm"]
     if height_cm is None:
         height_cm = PASSPORT_CONFIG["photo_height_cm"]
+    print_size = (cm_to_px(width_cm), cm_to_px(height_cm))
+    
     try:
-        # Open and load image (not using context manager since we need to save after)
-        img = Image.open(image_path)
-        
-        # Convert to RGB if necessary (handles RGBA, P, etc.)
-        if img.mode != "RGB":
-            img = img.convert("RGB")
-        
-        original_width, original_height = img.size
-        target_aspect = width_cm / height_cm
-        current_aspect = original_width / original_height
+        # Image.open only parses the header, so files that need no crop, resize or
+        # rotation (e.g. re-uploads of processed photos) are never decoded
+        with Image.open(image_path) as probe:
+            width, height = probe.size
+            if (abs(width / height - width_cm / height_cm) < 0.001
+                    and probe.getexif().get(EXIF_ORIENTATION, 1) == 1
+                    and (probe.size == print_size or width < print_size[0] or height < print_size[1])):
+                return True
         
-        # If aspect ratios match (within small tolerance), no cropping needed
-        if abs(current_aspect - target_aspect) < 0.001:
-            img.close()
-            return True
+        # Open and load image (not using context manager since we need to save after)
+        img = open_photo(image_path, width_cm, height_cm)
+        box = _aspect_crop_box(img.size, width_cm, height_cm)
+        crop_size = (box[2] - box[0], box[3] - box[1])
         
-        # Calculate crop dimensions
-        if current_aspect > target_aspect:
-            # Image is wider than target - crop width
-            new_width = int(original_height * target_aspect)
-            new_height = original_height
-            left = (original_width - new_width) // 2
-            top = 0
-            right = left + new_width
-            bottom = new_height
+        if (crop_size != print_size
+                and crop_size[0] >= print_size[0] and crop_size[1] >= print_size[1]):
+            # Crop and downscale in one resampling pass, reading only the cropped area
+            rgb = img if img.mode == "RGB" else img.convert("RGB")
+            cropped_img = rgb.resize(print_size, Image.LANCZOS, box=box, reducing_gap=LANCZOS_REDUCING_GAP)
+            if rgb is not img:
+                rgb.close()
         else:
-            # Image is taller than target - crop height
-            new_width = original_width
-            new_height = int(original_width / target_aspect)
-            left = 0
-            top = (original_height - new_height) // 2
-            right = new_width
-            bottom = top + new_height
+            cropped_img = crop_image_to_aspect_ratio(img, width_cm, height_cm)
         
-        # Perform centered crop
-        cropped_img = img.crop((left, top, right, bottom))
-        img.close()
-        
-        # Save the cropped image, preserving original format
-        # Determine output format from file extension
-        ext = os.path.splitext(image_path)[1].lower()
-        if ext in ['.jpg', '.jpeg']:
-            cropped_img.save(image_path, "JPEG", quality=JPEG_QUALITY, subsampling=0)
-        elif ext == '.png':
-            cropped_img.save(image_path, "PNG")
-        else:
-            # Default to JPEG
-            cropped_img.save(image_path, "JPEG", quality=JPEG_QUALITY, subsampling=0)
+        # Only rewrite the file if it was cropped or resized, or had to be rotated upright
+        if cropped_img.size != img.size or "orientation" in img.info:
+            save_photo(cropped_img, image_path)
         
         cropped_img.close()
+        img.close()
         return True
         
     except Exception as e:
@@ -193,11 +452,79 @@ def crop_to_passport_aspect_ratio(image_path: str, width_cm: float = None, heigh
         return False
 
 
-def remove_background(image_path: str, bg_color: str = "#FFFFFF") -> bool:
+def crop_batch(paths: List[str], width_cm: float = None, height_cm: float = None) -> List[bool]:
+    """
+    Crop several image files in place concurrently (see crop_to_passport_aspect_ratio).
+    
+    Pillow releases the GIL while decoding and encoding, so threads scale with cores.
+    
+    Returns:
+        Per-path success flags, in input order
     """
-    Remove background from an image and replace with solid color.
+    if not paths:
+        return []
+    # Uploads with the same name share a path; crop each file only once
+    unique_paths = list(dict.fromkeys(paths))
+    max_workers = min(8, os.cpu_count() or 4, len(unique_paths))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        results = dict(zip(unique_paths, executor.map(
+            lambda path: crop_to_passport_aspect_ratio(path, width_cm, height_cm), unique_paths
+        )))
+    return [results[path] for path in paths]
+
+
+def remove_background_image(img: Image.Image, bg_color: str = "#FFFFFF") -> Image.Image:
+    """
+    Replace the background of an in-memory image with a solid color.
     Optimized for limited server resources.
     
+    Args:
+        img: PIL image to process
+        bg_color: Hex color code for background (default: white)
+    
+    Returns:
+        New RGB image with the background replaced
+    
+    Raises:
+        ImportError: If rembg is not installed
+        ValueError: If bg_color is not a valid hex color
+    """
+    # Parsed (and memoized) up front so a bad color fails before model inference
+    bg_rgb = parse_hex_color(bg_color)
+    if bg_rgb is None:
+        raise ValueError(f"Invalid color format: {bg_color}")
+    
+    session = get_rembg_session()
+    
+    original_size = img.size
+    max_dimension = 2000  # Limit for memory efficiency
+    
+    # Resize if too large
+    if max(img.size) > max_dimension:
+        ratio = max_dimension / max(img.size)
+        new_size = (int(img.size[0] * ratio), int(img.size[1] * ratio))
+        img = img.resize(new_size, Image.BILINEAR, reducing_gap=2.0)
+        logger.info(f"Resized from {original_size} to {new_size} for processing")
+    
+    # Remove background with the cached model session; rembg takes and returns
+    # PIL images directly, so no PNG encode/decode round trip is needed
+    cutout = rembg_remove(img, session=session)
+    if cutout.mode != "RGBA":
+        cutout = cutout.convert("RGBA")
+    
+    # Create new image with solid background
+    background = Image.new("RGB", cutout.size, bg_rgb)
+    
+    # Paste the image with transparency
+    background.paste(cutout, (0, 0), cutout)
+    cutout.close()
+    return background
+
+
+def remove_background(image_path: str, bg_color: str = "#FFFFFF") -> bool:
+    """
+    Remove background from an image file and replace with solid color.
+    
     Args:
         image_path: Path to the image file
         bg_color: Hex color code for background (default: white)
@@ -206,53 +533,13 @@ def remove_background(image_path: str, bg_color: str = "#FFFFFF") -> bool:
         True if successful, False otherwise
     """
     try:
-        from rembg import remove
-        
-        # Open and potentially resize image
         img = Image.open(image_path)
-        original_size = img.size
-        max_dimension = 2000  # Limit for memory efficiency
-        
-        # Resize if too large
-        if max(img.size) > max_dimension:
-            ratio = max_dimension / max(img.size)
-            new_size = (int(img.size[0] * ratio), int(img.size[1] * ratio))
-            img = img.resize(new_size, Image.LANCZOS)
-            logger.info(f"Resized from {original_size} to {new_size} for processing")
-        
-        # Convert to bytes
-        buffer = io.BytesIO()
-        img.save(buffer, format='PNG')
-        input_data = buffer.getvalue()
-        
-        # Remove background with lighter model
-        from rembg import new_session
-        session = new_session('u2net_human_seg')
-        output_data = remove(input_data, session=session)
-        
-        # Open as PIL Image
-        img = Image.open(io.BytesIO(output_data)).convert("RGBA")
-        
-        # Convert hex color to RGB
-        bg_rgb = tuple(int(bg_color.lstrip('#')[i:i+2], 16) for i in (0, 2, 4))
-        
-        # Create new image with solid background
-        background = Image.new("RGB", img.size, bg_rgb)
-        
-        # Paste the image with transparency
-        background.paste(img, (0, 0), img)
+        background = remove_background_image(img, bg_color)
+        img.close()
         
         # Save the result
-        ext = os.path.splitext(image_path)[1].lower()
-        if ext in ['.jpg', '.jpeg']:
-            background.save(image_path, "JPEG", quality=JPEG_QUALITY, subsampling=0)
-        elif ext == '.png':
-            background.save(image_path, "PNG")
-        else:
-            background.save(image_path, "JPEG", quality=JPEG_QUALITY, subsampling=0)
-        
+        save_photo(background, image_path)
         background.close()
-        img.close()
         
         logger.info(f"Background removed from {os.path.basename(image_path)}")
         return True
@@ -265,6 +552,28 @@ def remove_background(image_path: str, bg_color: str = "#FFFFFF") -> bool:
         return False
 
 
+def remove_background_batch(paths: List[str], bg_color: str = "#FFFFFF") -> List[bool]:
+    """
+    Remove the background from several image files concurrently.
+    
+    All threads share the cached rembg session; onnxruntime releases the GIL
+    during inference, so photos are processed in parallel.
+    
+    Returns:
+        Per-path success flags, in input order
+    """
+    if not paths:
+        return []
+    # Uploads with the same name share a path; process each file only once
+    unique_paths = list(dict.fromkeys(paths))
+    max_workers = min(4, os.cpu_count() or 4, len(unique_paths))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        results = dict(zip(unique_paths, executor.map(
+            lambda path: remove_background(path, bg_color), unique_paths
+        )))
+    return [results[path] for path in paths]
+
+
 # ==================================================
 # PDF GENERATOR
 # ==================================================
@@ -281,6 +590,7 @@ def generate_pdf(
     photo_width_cm: float = None,
     photo_height_cm: float = None,
     cut_line_style: str = "full",
+    images: Optional[Dict[str, Image.Image]] = None,
 ) -> str:
     """
     Generate a PDF file with photos arranged in a grid.
@@ -298,6 +608,7 @@ def generate_pdf(
         photo_width_cm: Photo width in cm (default: 3.5 cm)
         photo_height_cm: Photo height in cm (default: 4.5 cm)
         cut_line_style: Style of cut lines - "full" for complete lines or "crosshair" for registration marks
+        images: Already-prepared images keyed by photo path, used instead of re-reading those files
     
     Returns:
         Path to the generated PDF file
@@ -305,14 +616,16 @@ def generate_pdf(
     Raises:
         IOError: If output directory doesn't exist or file cannot be written
     """
+    from reportlab.pdfgen import canvas
+    from reportlab.lib.utils import ImageReader
+    
     if photo_width_cm is None:
         photo_width_cm = PASSPORT_CONFIG["photo_width_cm"]
     if photo_height_cm is None:
         photo_height_cm = PASSPORT_CONFIG["photo_height_cm"]
-    if not os.path.exists(output_dir):
-        os.makedirs(output_dir, exist_ok=True)
+    os.makedirs(output_dir, exist_ok=True)
     
-    ts = datetime.now().strftime("%Y%m%d_%H%M%S")
+    ts = _unique_ts()
     output_path = os.path.join(output_dir, f"passport_{ts}.pdf")
 
     paper_w_pt, paper_h_pt, paper_w_cm, paper_h_cm = resolve_paper_size(
@@ -321,8 +634,8 @@ def generate_pdf(
 
     c = canvas.Canvas(output_path, pagesize=(paper_w_pt, paper_h_pt))
 
-    photo_w = photo_width_cm * cm
-    photo_h = photo_height_cm * cm
+    photo_w = photo_width_cm * CM_TO_PT
+    photo_h = photo_height_cm * CM_TO_PT
 
     cols, rows = calculate_grid(
         paper_w_cm,
@@ -345,32 +658,59 @@ def generate_pdf(
     offset_x_cm = (usable_w_cm - grid_width_cm) / 2 if cols > 0 else 0
     offset_y_cm = (usable_h_cm - grid_height_cm) / 2 if rows > 0 else 0
 
+    # Slot origin and stride in points; only the column/row multiples vary per copy
+    base_x_pt = (margin_cm + offset_x_cm) * CM_TO_PT
+    base_y_pt = (margin_cm + offset_y_cm + photo_height_cm) * CM_TO_PT
+    step_x_pt = (photo_width_cm + col_gap_cm) * CM_TO_PT
+    step_y_pt = (photo_height_cm + row_gap_cm) * CM_TO_PT
+    positions = [
+        (base_x_pt + (s % cols) * step_x_pt, paper_h_pt - (base_y_pt + (s // cols) * step_y_pt))
+        for s in range(per_page)
+    ]
+
+    present = _existing_paths(photos)
+    # Form name per unique path (None if unreadable); uploads with the same name
+    # share a path, so a path can appear in photos more than once
+    forms: Dict[str, Optional[str]] = {}
     for img_path in photos:
-        if not os.path.exists(img_path):
+        if img_path not in present:
             continue  # Skip missing files
         
+        if img_path not in forms:
+            prepared = images.get(img_path) if images else None
+            source = ImageReader(prepared) if prepared is not None else img_path
+            
+            # Embed each photo once as a form XObject that every copy references;
+            # drawImage on an in-memory image would re-hash its pixels per copy
+            forms[img_path] = f"photo_{len(forms)}"
+            c.beginForm(forms[img_path], upperx=photo_w, uppery=photo_h)
+            try:
+                c.drawImage(source, 0, 0, photo_w, photo_h, mask="auto")
+            except Exception:
+                # Skip corrupted images
+                forms[img_path] = None
+            finally:
+                c.endForm()
+        
+        form_name = forms[img_path]
+        if form_name is None:
+            continue
+        
         copies = copies_map.get(img_path, 1)
         for _ in range(copies):
             if slot == per_page:
                 c.showPage()
                 slot = 0
 
-            col = slot % cols
-            row = slot // cols
-
-            x = (margin_cm + offset_x_cm + col * (photo_width_cm + col_gap_cm)) * cm
-            y = paper_h_pt - (
-                (margin_cm + offset_y_cm + photo_height_cm + row * (photo_height_cm + row_gap_cm)) * cm
-            )
+            x, y = positions[slot]
 
-            try:
-                c.drawImage(img_path, x, y, photo_w, photo_h, mask="auto")
-            except Exception:
-                # Skip corrupted images
-                continue
+            c.saveState()
+            c.translate(x, y)
+            c.doForm(form_name)
+            c.restoreState()
 
-            # Draw thin border around photo
-            c.setStrokeColorRGB(0, 0, 0)  # Black border
+            # Draw thin black border around photo (black is the canvas default
+            # stroke color, and showPage resets to it, so it is never set per copy)
             c.setLineWidth(0.3)  # Thinner professional border
             c.rect(x, y, photo_w, photo_h, stroke=1, fill=0)
 
@@ -383,7 +723,7 @@ def generate_pdf(
     if cut_lines and (rows > 1 or cols > 1):
         if cut_line_style == "crosshair":
             # Professional registration marks (crosshairs)
-            mark_size = 0.5 * cm  # Size of crosshair marks
+            mark_size = 0.5 * CM_TO_PT  # Size of crosshair marks
             c.setLineWidth(0.5)
             c.setDash([3, 2])  # Dashed pattern
             
@@ -397,23 +737,23 @@ def generate_pdf(
                     # Calculate position
                     if row == 0:
                         # Top edge - place crosshair above photos
-                        y_pos = paper_h_pt - ((margin_cm + offset_y_cm - 0.3) * cm)
+                        y_pos = paper_h_pt - ((margin_cm + offset_y_cm - 0.3) * CM_TO_PT)
                     elif row == rows:
                         # Bottom edge - place crosshair below photos
-                        y_pos = paper_h_pt - ((margin_cm + offset_y_cm + grid_height_cm + 0.3) * cm)
+                        y_pos = paper_h_pt - ((margin_cm + offset_y_cm + grid_height_cm + 0.3) * CM_TO_PT)
                     else:
                         # Between photos - in the gap center
-                        y_pos = paper_h_pt - ((margin_cm + offset_y_cm + row * photo_height_cm + (row - 0.5) * row_gap_cm) * cm)
+                        y_pos = paper_h_pt - ((margin_cm + offset_y_cm + row * photo_height_cm + (row - 0.5) * row_gap_cm) * CM_TO_PT)
                     
                     if col == 0:
                         # Left edge - place crosshair left of photos
-                        x_pos = ((margin_cm + offset_x_cm - 0.3) * cm)
+                        x_pos = ((margin_cm + offset_x_cm - 0.3) * CM_TO_PT)
                     elif col == cols:
                         # Right edge - place crosshair right of photos
-                        x_pos = ((margin_cm + offset_x_cm + grid_width_cm + 0.3) * cm)
+                        x_pos = ((margin_cm + offset_x_cm + grid_width_cm + 0.3) * CM_TO_PT)
                     else:
                         # Between photos - in the gap center
-                        x_pos = (margin_cm + offset_x_cm + col * photo_width_cm + (col - 0.5) * col_gap_cm) * cm
+                        x_pos = (margin_cm + offset_x_cm + col * photo_width_cm + (col - 0.5) * col_gap_cm) * CM_TO_PT
                     
                     # Draw horizontal line in blue
                     c.setStrokeColorRGB(0.0, 0.4, 0.8)  # Blue
@@ -433,17 +773,17 @@ def generate_pdf(
             # Horizontal cut lines
             if rows > 1:
                 for row in range(1, rows):
-                    y_line = paper_h_pt - ((margin_cm + offset_y_cm + row * photo_height_cm + (row - 0.5) * row_gap_cm) * cm)
-                    x_start = (margin_cm + offset_x_cm) * cm
-                    x_end = (margin_cm + offset_x_cm + grid_width_cm) * cm
+                    y_line = paper_h_pt - ((margin_cm + offset_y_cm + row * photo_height_cm + (row - 0.5) * row_gap_cm) * CM_TO_PT)
+                    x_start = (margin_cm + offset_x_cm) * CM_TO_PT
+                    x_end = (margin_cm + offset_x_cm + grid_width_cm) * CM_TO_PT
                     c.line(x_start, y_line, x_end, y_line)
             
             # Vertical cut lines
             if cols > 1:
                 for col in range(1, cols):
-                    x_line = (margin_cm + offset_x_cm + col * photo_width_cm + (col - 0.5) * col_gap_cm) * cm
-                    y_start = paper_h_pt - ((margin_cm + offset_y_cm) * cm)
-                    y_end = paper_h_pt - ((margin_cm + offset_y_cm + grid_height_cm) * cm)
+                    x_line = (margin_cm + offset_x_cm + col * photo_width_cm + (col - 0.5) * col_gap_cm) * CM_TO_PT
+                    y_start = paper_h_pt - ((margin_cm + offset_y_cm) * CM_TO_PT)
+                    y_end = paper_h_pt - ((margin_cm + offset_y_cm + grid_height_cm) * CM_TO_PT)
                     c.line(x_line, y_start, x_line, y_end)
             
             c.setDash()
@@ -463,6 +803,61 @@ def zip_files(files: List[str], output_dir: str) -> str:
     Returns:
         Path to the created ZIP file
     """
+    os.makedirs(output_dir, exist_ok=True)
+    
+    ts = _unique_ts()
+    output_path = os.path.join(output_dir, f"passport_photos_{ts}.zip")
+    
+    with zipfile.ZipFile(output_path, "w", allowZip64=True) as zf:
+        for path in files:
+            arcname = os.path.basename(path)
+            if path.lower().endswith(PRECOMPRESSED_EXTENSIONS):
+                # Already compressed; deflating again costs CPU for no gain. Store it,
+                # copying in large chunks (ZipFile.write uses 8 KB) to keep syscalls low
+                info = zipfile.ZipInfo.from_file(path, arcname=arcname)
+                info.compress_type = zipfile.ZIP_STORED
+                with open(path, "rb") as src, zf.open(info, "w") as dest:
+                    if info.file_size > ZIP_MMAP_THRESHOLD:
+                        # Large outputs are written straight from the page cache
+                        with mmap.mmap(src.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                            dest.write(mapped)
+                    else:
+                        shutil.copyfileobj(src, dest, ZIP_COPY_CHUNK_SIZE)
+            else:
+                zf.write(path, arcname=arcname, compress_type=zipfile.ZIP_DEFLATED, compresslevel=1)
+    
+    return output_path
+
+
+def crosshair_masks(mark_size: int, dash_length: int, gap_length: int) -> Tuple[Image.Image, Image.Image, int]:
+    """
+    Rasterize the dashed arms of a registration crosshair into "L" masks.
+    
+    The arms are drawn with the same 2px ImageDraw.line dashes as drawing them
+    directly on the page, around a center at (offset, offset) in each mask.
+    
+    Returns:
+        Tuple of (horizontal_mask, vertical_mask, offset); paste each mask at
+        (x - offset, y - offset) to center the crosshair on (x, y)
+    """
+    # Margin for the 2px line width on either side of the center line
+    offset = mark_size + 2
+    size = (2 * offset + 1, 2 * offset + 1)
+    h_mask = Image.new("L", size, 0)
+    v_mask = Image.new("L", size, 0)
+    h_draw = ImageDraw.Draw(h_mask)
+    v_draw = ImageDraw.Draw(v_mask)
+    
+    current = offset - mark_size
+    end = offset + mark_size
+    while current < end:
+        next_end = min(current + dash_length, end)
+        h_draw.line([(current, offset), (next_end, offset)], fill=255, width=2)
+        v_draw.line([(offset, current), (offset, next_end)], fill=255, width=2)
+        current = next_end + gap_length
+    return h_mask, v_mask, offset
+
+
 def generate_jpeg(
     photos: List[str],
     copies_map: Dict[str, int],
@@ -476,6 +871,7 @@ def generate_jpeg(
     photo_width_cm: float = None,
     photo_height_cm: float = None,
     cut_line_style: str = "full",
+    images: Optional[Dict[str, Image.Image]] = None,
 ) -> List[str]:
     """
     Generate JPEG files with photos arranged in a grid.
@@ -493,6 +889,7 @@ def generate_jpeg(
         photo_width_cm: Photo width in cm (default: 3.5 cm)
         photo_height_cm: Photo height in cm (default: 4.5 cm)
         cut_line_style: Style of cut lines - "full" for complete lines or "crosshair" for registration marks
+        images: Already-prepared images keyed by photo path, used instead of re-reading those files
     
     Returns:
         List of paths to the generated JPEG files
@@ -504,30 +901,27 @@ def generate_jpeg(
         photo_width_cm = PASSPORT_CONFIG["photo_width_cm"]
     if photo_height_cm is None:
         photo_height_cm = PASSPORT_CONFIG["photo_height_cm"]
-    if not os.path.exists(output_dir):
-        os.makedirs(output_dir, exist_ok=True)
+    os.makedirs(output_dir, exist_ok=True)
+    # Sheets have their own resolution; stored photos and PDFs stay at DPI
+    dpi = settings.JPEG_SHEET_DPI
 
     # -----------------------------
     # PAPER SIZE
     # -----------------------------
-    size = PAPER_SIZES.get(paper_size, PAPER_SIZES["A4"])
-    paper_w_cm = float(size["width_cm"])
-    paper_h_cm = float(size["height_cm"])
-
-    if orientation == "landscape":
-        paper_w_cm, paper_h_cm = paper_h_cm, paper_w_cm
+    # Shared (memoized) with the PDF generator
+    _, _, paper_w_cm, paper_h_cm = resolve_paper_size(paper_size, orientation)
 
-    paper_w_px = cm_to_px(paper_w_cm)
-    paper_h_px = cm_to_px(paper_h_cm)
+    paper_w_px = cm_to_px(paper_w_cm, dpi)
+    paper_h_px = cm_to_px(paper_h_cm, dpi)
 
     # -----------------------------
     # Layout calculation
-    margin_px = cm_to_px(margin_cm)
-    col_gap_px = cm_to_px(col_gap_cm)
-    row_gap_px = cm_to_px(row_gap_cm)
+    margin_px = cm_to_px(margin_cm, dpi)
+    col_gap_px = cm_to_px(col_gap_cm, dpi)
+    row_gap_px = cm_to_px(row_gap_cm, dpi)
 
-    photo_w_px = cm_to_px(photo_width_cm)
-    photo_h_px = cm_to_px(photo_height_cm)
+    photo_w_px = cm_to_px(photo_width_cm, dpi)
+    photo_h_px = cm_to_px(photo_height_cm, dpi)
 
     usable_w = paper_w_px - 2 * margin_px
     usable_h = paper_h_px - 2 * margin_px
@@ -544,161 +938,212 @@ def generate_jpeg(
     # -----------------------------
     # EXPAND PHOTOS BY COPIES
     # -----------------------------
+    present = _existing_paths(photos)
     expanded = []
     for path in photos:
-        if os.path.exists(path):
+        if path in present:
             expanded.extend([path] * copies_map.get(path, 1))
 
     if not expanded:
         return []
 
+    # -----------------------------
+    # RESIZE EACH UNIQUE PHOTO ONCE
+    # -----------------------------
+    # Every copy of a photo is pasted from the same resized image
+    def resize_photo(path: str) -> Optional[Image.Image]:
+        try:
+            prepared = images.get(path) if images else None
+            if prepared is not None:
+                img = prepared
+            elif pyvips is not None:
+                return _vips_tile(path, photo_w_px, photo_h_px)
+            else:
+                # JPEGs decode at a DCT-scaled size near 2x the printed size
+                img = open_photo(path, photo_width_cm, photo_height_cm)
+                if img.width < photo_w_px or img.height < photo_h_px:
+                    logger.warning(
+                        f"Photo {path} is {img.width}x{img.height}, below the "
+                        f"{photo_w_px}x{photo_h_px} needed at {dpi} DPI; it will be upscaled"
+                    )
+            rgb = img if img.mode == "RGB" else img.convert("RGB")
+            if rgb.size == (photo_w_px, photo_h_px):
+                # Already at sheet size (stored photos are when the sheet is at DPI)
+                tile = rgb.copy() if rgb is prepared else rgb
+            else:
+                tile = rgb.resize((photo_w_px, photo_h_px), Image.LANCZOS, reducing_gap=LANCZOS_REDUCING_GAP)
+            for temp in (rgb, img):
+                if temp is not tile and temp is not prepared:
+                    temp.close()
+            return tile
+        except Exception as e:
+            # Skip corrupted images
+            logger.warning(f"Failed to process image {path}: {e}")
+            return None
+
+    unique_paths = list(dict.fromkeys(expanded))
+    if len(unique_paths) > 1:
+        # Decoding and resampling release the GIL, so photos are resized in parallel
+        max_workers = min(8, os.cpu_count() or 4, len(unique_paths))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            resized = dict(zip(unique_paths, executor.map(resize_photo, unique_paths)))
+    else:
+        resized = {path: resize_photo(path) for path in unique_paths}
+
     # -----------------------------
     # PAGE GENERATION
     # -----------------------------
-    pages = []
+    timestamp = _unique_ts()
+    page_count = -(-len(expanded) // (rows * cols))
+
+    # Slot positions depend only on the layout, so every page reuses them (row-major)
+    positions = [
+        (int(margin_px + offset_x_px + c * (photo_w_px + col_gap_px)),
+         int(margin_px + offset_y_px + r * (photo_h_px + row_gap_px)))
+        for r in range(rows)
+        for c in range(cols)
+    ]
+
+    # Cut lines depend only on the layout, so each dashed line or crosshair is
+    # rasterized once into a mask and pasted onto every page
+    cut_line_pastes = []
+    if cut_lines and (rows > 1 or cols > 1):
+        if cut_line_style == "crosshair":
+            # Professional registration marks (crosshairs)
+            mark_size = int(cm_to_px(0.5, dpi))
+            offset_edge = int(cm_to_px(0.3, dpi))  # Offset for edge crosshairs
+            blue_color = (0, 102, 204)  # Blue
+            red_color = (204, 0, 51)  # Red
+            h_mask, v_mask, mark_offset = crosshair_masks(mark_size, dash_length=8, gap_length=4)
+            
+            # Draw crosshairs at intersections
+            for row in range(rows + 1):
+                for col in range(cols + 1):
+                    # Skip the four absolute corners
+                    if (row == 0 or row == rows) and (col == 0 or col == cols):
+                        continue
+                    
+                    # Calculate position
+                    if row == 0:
+                        # Top edge - place crosshair above photos
+                        y_pos = int(margin_px + offset_y_px - offset_edge)
+                    elif row == rows:
+                        # Bottom edge - place crosshair below photos
+                        y_pos = int(margin_px + offset_y_px + grid_height_px + offset_edge)
+                    else:
+                        # Between photos - in the gap center
+                        y_pos = int(margin_px + offset_y_px + row * photo_h_px + (row - 0.5) * row_gap_px)
+                    
+                    if col == 0:
+                        # Left edge - place crosshair left of photos
+                        x_pos = int(margin_px + offset_x_px - offset_edge)
+                    elif col == cols:
+                        # Right edge - place crosshair right of photos
+                        x_pos = int(margin_px + offset_x_px + grid_width_px + offset_edge)
+                    else:
+                        # Between photos - in the gap center
+                        x_pos = int(margin_px + offset_x_px + col * photo_w_px + (col - 0.5) * col_gap_px)
+                    
+                    # Dashed horizontal line in blue, then dashed vertical line in red
+                    origin = (x_pos - mark_offset, y_pos - mark_offset)
+                    cut_line_pastes.append((blue_color, origin, h_mask))
+                    cut_line_pastes.append((red_color, origin, v_mask))
+        else:
+            # Full cut lines (default)
+            dash_length = 8
+            gap_length = 4
+            line_color = (100, 100, 100)
+            
+            # Horizontal cut lines
+            if rows > 1:
+                x_start = int(margin_px + offset_x_px)
+                x_end = int(margin_px + offset_x_px + grid_width_px)
+                mask = dashed_line_mask(x_end - x_start, dash_length, gap_length)
+                for row in range(1, rows):
+                    y_line = int(margin_px + offset_y_px + row * photo_h_px + (row - 0.5) * row_gap_px)
+                    cut_line_pastes.append((line_color, (x_start, y_line), mask))
+            
+            # Vertical cut lines
+            if cols > 1:
+                y_start = int(margin_px + offset_y_px)
+                y_end = int(margin_px + offset_y_px + grid_height_px)
+                mask = dashed_line_mask(y_end - y_start, dash_length, gap_length, vertical=True)
+                for col in range(1, cols):
+                    x_line = int(margin_px + offset_x_px + col * photo_w_px + (col - 0.5) * col_gap_px)
+                    cut_line_pastes.append((line_color, (x_line, y_start), mask))
+
+    def save_page(page_number, page):
+        filename = f"passport_page_{page_number}_{timestamp}.jpg"
+        path = os.path.join(output_dir, filename)
+        page.save(
+            path, "JPEG",
+            quality=settings.OUTPUT_JPEG_QUALITY,
+            subsampling=settings.OUTPUT_JPEG_SUBSAMPLING,
+        )
+        page.close()
+        return path
+
+    def copy_page(page_number, source):
+        # Waits on an earlier submission, so it never blocks the pool
+        filename = f"passport_page_{page_number}_{timestamp}.jpg"
+        path = os.path.join(output_dir, filename)
+        shutil.copyfile(source.result(), path)
+        return path
+
+    # Each finished page is encoded and written by the pool while the next one is
+    # composed; Pillow releases the GIL while encoding, so pages also encode in parallel
+    max_workers = min(8, os.cpu_count() or 4, page_count)
+    futures = []
+    # Pages with the same photos in the same slots, e.g. one photo in many copies,
+    # come out byte-identical, so only the first is composed and encoded
+    rendered = {}
     idx = 0
 
-    while idx < len(expanded):
-        page = Image.new("RGB", (paper_w_px, paper_h_px), "white")
-        
-        # Store positions for cut lines (if needed)
-        photo_positions = []
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        while idx < len(expanded):
+            page_photos = tuple(expanded[idx:idx + len(positions)])
+            if page_photos in rendered:
+                futures.append(executor.submit(copy_page, len(futures) + 1, rendered[page_photos]))
+                idx += len(page_photos)
+                continue
+            
+            page = Image.new("RGB", (paper_w_px, paper_h_px), "white")
+            # One drawing context per page, shared by the borders and cut lines
+            draw = ImageDraw.Draw(page)
 
-        for r in range(rows):
-            for c in range(cols):
+            for x, y in positions:
                 if idx >= len(expanded):
                     break
 
-                x = margin_px + offset_x_px + c * (photo_w_px + col_gap_px)
-                y = margin_px + offset_y_px + r * (photo_h_px + row_gap_px)
-
-                try:
-                    img = Image.open(expanded[idx])
-                    img = img.convert("RGB")
-                    img = img.resize((photo_w_px, photo_h_px), Image.LANCZOS)
-                    # Load the image data completely before pasting
-                    img.load()
-                    page.paste(img, (int(x), int(y)))
-                    img.close()
-                    
-                    # Draw thin border around photo
-                    draw_temp = ImageDraw.Draw(page)
-                    draw_temp.rectangle(
-                        [int(x), int(y), int(x + photo_w_px), int(y + photo_h_px)],
-                        outline=(0, 0, 0),  # Black border
-                        width=1  # Thinner professional border
-                    )
-                    
-                    if cut_lines:
-                        photo_positions.append((int(x), int(y), photo_w_px, photo_h_px))
-                except Exception as e:
-                    # Skip corrupted images
-                    logger.warning(f"Failed to process image {expanded[idx]}: {e}")
+                img = resized[expanded[idx]]
+                if img is None:
+                    # Leave the slot empty, as for any unreadable photo
                     idx += 1
                     continue
+                
+                # Copies the cached tile's rows straight into the page buffer; no
+                # per-copy image is allocated
+                page.paste(img, (x, y))
+                
+                # Draw thin border around photo
+                draw.rectangle(
+                    [x, y, x + photo_w_px, y + photo_h_px],
+                    outline=(0, 0, 0),  # Black border
+                    width=1  # Thinner professional border
+                )
 
                 idx += 1
 
-        # Draw cut lines after all images are pasted
-        if cut_lines and (rows > 1 or cols > 1):
-            draw = ImageDraw.Draw(page)
-            
-            if cut_line_style == "crosshair":
-                # Professional registration marks (crosshairs)
-                mark_size = int(cm_to_px(0.5))
-                dash_length = 8
-                gap_length = 4
-                offset_edge = int(cm_to_px(0.3))  # Offset for edge crosshairs
-                
-                # Draw crosshairs at intersections
-                for row in range(rows + 1):
-                    for col in range(cols + 1):
-                        # Skip the four absolute corners
-                        if (row == 0 or row == rows) and (col == 0 or col == cols):
-                            continue
-                        
-                        # Calculate position
-                        if row == 0:
-                            # Top edge - place crosshair above photos
-                            y_pos = int(margin_px + offset_y_px - offset_edge)
-                        elif row == rows:
-                            # Bottom edge - place crosshair below photos
-                            y_pos = int(margin_px + offset_y_px + grid_height_px + offset_edge)
-                        else:
-                            # Between photos - in the gap center
-                            y_pos = int(margin_px + offset_y_px + row * photo_h_px + (row - 0.5) * row_gap_px)
-                        
-                        if col == 0:
-                            # Left edge - place crosshair left of photos
-                            x_pos = int(margin_px + offset_x_px - offset_edge)
-                        elif col == cols:
-                            # Right edge - place crosshair right of photos
-                            x_pos = int(margin_px + offset_x_px + grid_width_px + offset_edge)
-                        else:
-                            # Between photos - in the gap center
-                            x_pos = int(margin_px + offset_x_px + col * photo_w_px + (col - 0.5) * col_gap_px)
-                        
-                        # Draw dashed horizontal crosshair line in blue
-                        blue_color = (0, 102, 204)  # Blue
-                        x_current = x_pos - mark_size
-                        x_end = x_pos + mark_size
-                        while x_current < x_end:
-                            x_next = min(x_current + dash_length, x_end)
-                            draw.line([(x_current, y_pos), (x_next, y_pos)], fill=blue_color, width=2)
-                            x_current = x_next + gap_length
-                        
-                        # Draw dashed vertical crosshair line in red
-                        red_color = (204, 0, 51)  # Red
-                        y_current = y_pos - mark_size
-                        y_end = y_pos + mark_size
-                        while y_current < y_end:
-                            y_next = min(y_current + dash_length, y_end)
-                            draw.line([(x_pos, y_current), (x_pos, y_next)], fill=red_color, width=2)
-                            y_current = y_next + gap_length
-            else:
-                # Full cut lines (default)
-                dash_length = 8
-                gap_length = 4
-                line_color = (100, 100, 100)
-                
-                # Horizontal cut lines
-                if rows > 1:
-                    for row in range(1, rows):
-                        y_line = int(margin_px + offset_y_px + row * photo_h_px + (row - 0.5) * row_gap_px)
-                        x_start = int(margin_px + offset_x_px)
-                        x_end = int(margin_px + offset_x_px + grid_width_px)
-                        
-                        x_current = x_start
-                        while x_current < x_end:
-                            x_next = min(x_current + dash_length, x_end)
-                            draw.line([(x_current, y_line), (x_next, y_line)], fill=line_color, width=1)
-                            x_current = x_next + gap_length
-                
-                # Vertical cut lines
-                if cols > 1:
-                    for col in range(1, cols):
-                        x_line = int(margin_px + offset_x_px + col * photo_w_px + (col - 0.5) * col_gap_px)
-                        y_start = int(margin_px + offset_y_px)
-                        y_end = int(margin_px + offset_y_px + grid_height_px)
-                        
-                        y_current = y_start
-                        while y_current < y_end:
-                            y_next = min(y_current + dash_length, y_end)
-                            draw.line([(x_line, y_current), (x_line, y_next)], fill=line_color, width=1)
-                            y_current = y_next + gap_length
-
-        pages.append(page)
+            # Draw cut lines after all images are pasted
+            for color, origin, mask in cut_line_pastes:
+                page.paste(color, origin, mask)
 
-    # -----------------------------
-    # SAVE JPEG FILES
-    # -----------------------------
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    output_files = []
+            futures.append(executor.submit(save_page, len(futures) + 1, page))
+            rendered[page_photos] = futures[-1]
 
-    for i, page in enumerate(pages, start=1):
-        filename = f"passport_page_{i}_{timestamp}.jpg"
-        path = os.path.join(output_dir, filename)
-        page.save(path, "JPEG", quality=JPEG_QUALITY, subsampling=0)
-        output_files.append(path)
+    for img in resized.values():
+        if img is not None:
+            img.close()
 
-    return output_files
+    # Pages are numbered in submission order
+    return [future.result() for future in futures]
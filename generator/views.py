@@ -10,14 +10,15 @@ from django.core.exceptions import ValidationError
 from django.http import HttpRequest, HttpResponse
 from django.contrib.auth.decorators import login_required
 
+from . import ratelimit
 from .models import PhotoGeneration
 from .tasks import generate_photosheet_task
 from .utils import (
     generate_pdf,
     generate_jpeg,
     zip_files,
-    crop_to_passport_aspect_ratio,
-    remove_background,
+    crop_batch,
+    remove_background_batch,
     PAPER_SIZES,
 )
 from .config import PASSPORT_CONFIG, PHOTO_SIZES
@@ -67,6 +68,9 @@ def index(request: HttpRequest) -> HttpResponse:
                 except ValidationError as e:
                     raise ValidationError(f"File {idx} ({f.name}): {str(e)}")
 
+            if ratelimit.is_over_limit(request.user.id):
+                raise ValueError("Generation limit reached. Please try again later.")
+
             session_id = uuid4().hex
             output_dir = os.path.join(
                 settings.MEDIA_ROOT, "outputs", session_id
@@ -119,11 +123,11 @@ def index(request: HttpRequest) -> HttpResponse:
                     for chunk in f.chunks():
                         dest.write(chunk)
                 
-                # Crop image to match selected photo aspect ratio
-                crop_to_passport_aspect_ratio(file_path, photo_width_cm, photo_height_cm)
-                
                 saved_photos.append(file_path)
             
+            # Crop images to match selected photo aspect ratio
+            crop_batch(saved_photos, photo_width_cm, photo_height_cm)
+            
             # ==================================================
             # BACKGROUND REMOVAL (if enabled)
             # ==================================================
@@ -214,6 +218,7 @@ def index(request: HttpRequest) -> HttpResponse:
                     total_copies=total_copies,
                     status='processing',
                 )
+                ratelimit.record(request.user.id)
 
                 task = generate_photosheet_task.delay(
                     session_id=session_id,
@@ -242,8 +247,8 @@ def index(request: HttpRequest) -> HttpResponse:
                 logger.info(f"Queued generation task for session {session_id}")
             else:
                 if remove_bg:
-                    for photo_path in saved_photos:
-                        success = remove_background(photo_path, bg_color)
+                    results = remove_background_batch(saved_photos, bg_color)
+                    for photo_path, success in zip(saved_photos, results):
                         if not success:
                             logger.warning(f"Failed to remove background from {os.path.basename(photo_path)}")
 
@@ -281,12 +286,15 @@ def index(request: HttpRequest) -> HttpResponse:
 
                     output_path = jpeg_files[0] if len(jpeg_files) == 1 else zip_files(jpeg_files, output_dir)
 
-                output_url = settings.MEDIA_URL + f"outputs/{session_id}/" + os.path.basename(output_path)
+                output_url = f"{settings.MEDIA_URL}outputs/{session_id}/{os.path.basename(output_path)}"
 
                 logger.info(f"Successfully generated {output_type} for session {session_id}")
                 
                 try:
-                    file_size = os.path.getsize(output_path) if os.path.exists(output_path) else None
+                    try:
+                        file_size = os.stat(output_path).st_size
+                    except OSError:
+                        file_size = None
                     total_copies = sum(copies_map.values())
                     PhotoGeneration.objects.create(
                         user=request.user if request.user.is_authenticated else None,
@@ -301,6 +309,7 @@ def index(request: HttpRequest) -> HttpResponse:
                         total_copies=total_copies,
                         status='completed',
                     )
+                    ratelimit.record(request.user.id)
                     logger.info(f"Saved generation history for session {session_id}")
                 except Exception as e:
                     logger.error(f"Failed to save generation history: {e}", exc_info=True)
@@ -56,6 +56,7 @@ MIDDLEWARE = [
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'generator.middleware.RequestLoggingMiddleware',
+    'generator.middleware.GenerationAuditMiddleware',
 ]
 
 ROOT_URLCONF = 'passport_app.urls'
@@ -101,7 +102,10 @@ else:
             'HOST': config('DB_HOST', default='localhost'),
             'PORT': config('DB_PORT', default='5432'),
             'ATOMIC_REQUESTS': True,
-            'CONN_MAX_AGE': 600,
+            # Transaction-mode pgbouncer compatible: no server-side cursors, and
+            # connections returned after each request
+            'CONN_MAX_AGE': config('DB_CONN_MAX_AGE', default=0, cast=int),
+            'DISABLE_SERVER_SIDE_CURSORS': config('DB_DISABLE_SERVER_SIDE_CURSORS', default=True, cast=bool),
         }
     }
 
@@ -185,6 +189,17 @@ CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = TIME_ZONE
 CELERY_TASK_TRACK_STARTED = True
 CELERY_TASK_TIME_LIMIT = 60 * 10
+# Photosheet tasks run for tens of seconds; reserve one at a time so short tasks
+# are not queued behind them on a busy worker (pair with `worker -Ofair`)
+CELERY_WORKER_PREFETCH_MULTIPLIER = 1
+# Workers keep the rembg model in memory; recycle children rarely so the load is amortized
+CELERY_WORKER_MAX_TASKS_PER_CHILD = config('CELERY_WORKER_MAX_TASKS_PER_CHILD', default=1000, cast=int)
+CELERY_BEAT_SCHEDULE = {
+    'flush-rate-limits': {
+        'task': 'generator.tasks.flush_rate_limits_task',
+        'schedule': 60.0,
+    },
+}
 
 # File upload settings
 MAX_FILE_SIZE_MB = config('MAX_FILE_SIZE_MB', default=10, cast=int)
@@ -194,7 +209,31 @@ DATA_UPLOAD_MAX_MEMORY_SIZE = MAX_FILE_SIZE_MB * 1024 * 1024
 # File cleanup settings (in hours)
 FILE_CLEANUP_HOURS = config('FILE_CLEANUP_HOURS', default=24, cast=int)
 
-# Rate limiting
+# Background removal model (rembg). REMBG_MODEL_PATH points at a custom ONNX file,
+# e.g. an INT8 copy written by `manage.py quantize_rembg_model`, and takes precedence
+REMBG_MODEL = config('REMBG_MODEL', default='u2net_human_seg')
+REMBG_MODEL_PATH = config('REMBG_MODEL_PATH', default='')
+# ONNX Runtime providers in order of preference; unavailable ones are skipped
+REMBG_PROVIDERS = config(
+    'REMBG_PROVIDERS',
+    default='CUDAExecutionProvider,CPUExecutionProvider',
+    cast=lambda v: [s.strip() for s in v.split(',') if s.strip()],
+)
+# CPU threads per inference; 0 keeps ONNX Runtime's default (one per physical core).
+# Lower it when several photos are processed at once so the threads don't oversubscribe
+REMBG_THREADS = config('REMBG_THREADS', default=0, cast=int)
+
+# Photo sheet JPEG encoding (0 = 4:4:4, 2 = 4:2:0). Quality 90 with 4:2:0 prints the
+# same at print resolution as 95 with 4:4:4, encodes about twice as fast and is ~40% smaller
+OUTPUT_JPEG_QUALITY = config('OUTPUT_JPEG_QUALITY', default=90, cast=int)
+OUTPUT_JPEG_SUBSAMPLING = config('OUTPUT_JPEG_SUBSAMPLING', default=2, cast=int)
+# Photo sheet JPEG resolution. 200 prints the same as 300 on consumer printers at under
+# half the pixels; set 300 for hi-res sheets. Stored photos and PDFs always use 300 DPI
+JPEG_SHEET_DPI = config('JPEG_SHEET_DPI', default=200, cast=int)
+
+# Rate limiting (counted in a Redis sliding window, see generator/ratelimit.py).
+# Generations are always counted; the hourly limit is only enforced when enabled
+RATE_LIMIT_ENFORCED = config('RATE_LIMIT_ENFORCED', default=False, cast=bool)
 RATE_LIMIT_PER_HOUR = config('RATE_LIMIT', default=100, cast=int)
 
 # Security settings for production